@@ -17,7 +17,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Optional
 
 import joblib
 import numpy as np
@@ -79,9 +79,9 @@ class AnomalyResult:
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrafficMetrics:
-    """Traffic metrics data point for anomaly detection."""
+    """Traffic metrics data point for anomaly detection (immutable)."""
 
     timestamp: datetime
     requests_per_second: float
@@ -119,7 +119,7 @@ class TrafficMetrics:
         )
 
     def to_feature_array(self) -> np.ndarray:
-        """Convert to feature array for ML model."""
+        """Convert to feature array for ML model (float32, as the forest uses)."""
         return np.array(
             [
                 self.requests_per_second,
@@ -127,7 +127,8 @@ class TrafficMetrics:
                 self.p95_latency_ms,
                 self.p99_latency_ms,
                 self.error_rate,
-            ]
+            ],
+            dtype=np.float32,
         )
 
 
@@ -293,31 +294,58 @@ class AnomalyDetector:
         Returns:
             AnomalyResult with detection details
         """
+        return self.detect_batch([metrics])[0]
+
+    def detect_batch(
+        self, metrics_list: list[TrafficMetrics | dict[str, Any]]
+    ) -> list[AnomalyResult]:
+        """
+        Detect anomalies in a batch of metrics.
+
+        The whole batch is scaled and scored by the Isolation Forest in a
+        single call, which is much cheaper than scoring points one by one.
+
+        Args:
+            metrics_list: List of traffic metrics
+
+        Returns:
+            List of AnomalyResult objects
+        """
         if not self.is_trained:
             raise RuntimeError(
                 "Model must be trained before detection. Call train() first."
             )
 
-        # Convert dict to TrafficMetrics if needed
-        if isinstance(metrics, dict):
-            metrics = TrafficMetrics.from_dict(metrics)
+        if not metrics_list:
+            return []
 
-        # Extract features
-        X = metrics.to_feature_array().reshape(1, -1)
+        # Convert dicts (or other mappings) to TrafficMetrics if needed
+        metrics_list = [
+            m if isinstance(m, TrafficMetrics) else TrafficMetrics.from_dict(m)
+            for m in metrics_list
+        ]
 
-        # Scale features
+        # Extract and scale features
+        X = np.array([m.to_feature_array() for m in metrics_list])
         X_scaled = self.scaler.transform(X)
 
-        # Get Isolation Forest score
-        raw_score = self.model.decision_function(X_scaled)[0]
-        prediction = self.model.predict(X_scaled)[0]
+        # Get Isolation Forest scores; predict() labels points with a
+        # negative decision function as anomalies, so reuse the scores
+        raw_scores = self.model.decision_function(X_scaled)
+
+        return [
+            self._build_result(metrics, raw_score)
+            for metrics, raw_score in zip(metrics_list, raw_scores)
+        ]
 
+    def _build_result(self, metrics: TrafficMetrics, raw_score: float) -> AnomalyResult:
+        """Build the AnomalyResult for one scored data point."""
         # Normalize score to 0-1 range (higher = more anomalous)
         # Isolation Forest scores: negative = anomaly, positive = normal
         normalized_score = self._normalize_score(raw_score)
 
         # Determine if it's an anomaly
-        is_anomaly = bool(prediction == -1)
+        is_anomaly = bool(raw_score < 0)
 
         # Identify specific anomaly type
         anomaly_type, type_score = self._identify_anomaly_type(metrics)
@@ -331,8 +359,10 @@ class AnomalyDetector:
         # Build explanation
         explanation = self._build_explanation(metrics, is_anomaly, anomaly_type)
 
-        # Create feature dict for debugging
-        features = {name: float(value) for name, value in zip(self.FEATURE_NAMES, X[0])}
+        # Create feature dict for debugging (full precision input values)
+        feature_dict = {
+            name: float(getattr(metrics, name)) for name in self.FEATURE_NAMES
+        }
 
         return AnomalyResult(
             is_anomaly=is_anomaly,
@@ -341,25 +371,11 @@ class AnomalyDetector:
             anomaly_type=anomaly_type if is_anomaly else None,
             severity=severity,
             confidence=confidence,
-            features=features,
+            features=feature_dict,
             explanation=explanation,
             timestamp=metrics.timestamp,
         )
 
-    def detect_batch(
-        self, metrics_list: list[TrafficMetrics | dict[str, Any]]
-    ) -> list[AnomalyResult]:
-        """
-        Detect anomalies in a batch of metrics.
-
-        Args:
-            metrics_list: List of traffic metrics
-
-        Returns:
-            List of AnomalyResult objects
-        """
-        return [self.detect(m) for m in metrics_list]
-
     def _normalize_score(self, raw_score: float) -> float:
         """
         Normalize Isolation Forest score to 0-1 range.
@@ -505,23 +521,20 @@ class AnomalyDetector:
             else "Anomaly detected in traffic patterns"
         )
 
-    def save(self, path: str | Path) -> None:
+    # Model components, saved as <name>.joblib files in a model directory
+    COMPONENTS = ("isolation_forest", "scaler", "metadata")
+
+    def save(self, path: str | Path | BinaryIO) -> None:
         """
         Save the trained model to disk.
 
         Args:
-            path: Directory path to save model files
+            path: Directory path to save model files, or a writable binary
+                file object to store all components in one joblib archive
         """
         if not self.is_trained:
             raise RuntimeError("Cannot save untrained model")
 
-        path = Path(path)
-        path.mkdir(parents=True, exist_ok=True)
-
-        # Save model components
-        joblib.dump(self.model, path / "isolation_forest.joblib")
-        joblib.dump(self.scaler, path / "scaler.joblib")
-
         # Save metadata
         metadata = {
             "contamination": self.contamination,
@@ -535,25 +548,45 @@ class AnomalyDetector:
             "training_samples": self.training_samples,
             "feature_names": self.FEATURE_NAMES,
         }
-        joblib.dump(metadata, path / "metadata.joblib")
+        components = dict(zip(self.COMPONENTS, (self.model, self.scaler, metadata)))
+
+        if hasattr(path, "write"):
+            joblib.dump(components, path)
+            logger.info("Model saved to file object")
+            return
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # Save model components
+        for name, component in components.items():
+            joblib.dump(component, path / f"{name}.joblib")
 
         logger.info(f"Model saved to {path}")
 
     @classmethod
-    def load(cls, path: str | Path) -> "AnomalyDetector":
+    def load(cls, path: str | Path | BinaryIO) -> "AnomalyDetector":
         """
         Load a trained model from disk.
 
         Args:
-            path: Directory path containing model files
+            path: Directory path containing model files, or a readable
+                binary file object written by save()
 
         Returns:
             Loaded AnomalyDetector instance
         """
-        path = Path(path)
+        if hasattr(path, "read"):
+            components = joblib.load(path)
+            source = "file object"
+        else:
+            path = Path(path)
+            components = {
+                name: joblib.load(path / f"{name}.joblib") for name in cls.COMPONENTS
+            }
+            source = str(path)
 
-        # Load metadata
-        metadata = joblib.load(path / "metadata.joblib")
+        metadata = components["metadata"]
 
         # Create instance
         detector = cls(
@@ -563,8 +596,8 @@ class AnomalyDetector:
         )
 
         # Load model components
-        detector.model = joblib.load(path / "isolation_forest.joblib")
-        detector.scaler = joblib.load(path / "scaler.joblib")
+        detector.model = components["isolation_forest"]
+        detector.scaler = components["scaler"]
 
         # Restore state
         detector.score_threshold = metadata["score_threshold"]
@@ -577,7 +610,7 @@ class AnomalyDetector:
         detector.training_samples = metadata["training_samples"]
         detector.is_trained = True
 
-        logger.info(f"Model loaded from {path}")
+        logger.info(f"Model loaded from {source}")
 
         return detector
 
@@ -641,35 +674,54 @@ class RealTimeAnomalyDetector:
         Returns:
             AnomalyResult with detection details
         """
-        # Convert dict to TrafficMetrics if needed
-        if isinstance(metrics, dict):
-            metrics = TrafficMetrics.from_dict(metrics)
+        return self.process_batch([metrics])[0]
+
+    def process_batch(
+        self, metrics_list: list[TrafficMetrics | dict[str, Any]]
+    ) -> list[AnomalyResult]:
+        """
+        Process a sequence of data points in arrival order.
+
+        The base detector scores the whole batch at once; the sliding window
+        and persistence tracking are then replayed point by point, so the
+        final state matches calling process() on each point in turn.
 
-        # Add to sliding window
-        self.window.append(metrics)
-        if len(self.window) > self.window_size:
-            self.window.pop(0)
+        Args:
+            metrics_list: Traffic metrics to analyze, oldest first
+
+        Returns:
+            List of AnomalyResult objects
+        """
+        # Convert dicts (or other mappings) to TrafficMetrics if needed
+        metrics_list = [
+            m if isinstance(m, TrafficMetrics) else TrafficMetrics.from_dict(m)
+            for m in metrics_list
+        ]
 
         # Run base detection
-        result = self.detector.detect(metrics)
+        results = self.detector.detect_batch(metrics_list)
 
-        # Track anomaly persistence
-        if result.is_anomaly:
-            self.anomaly_streak += 1
-        else:
-            self.anomaly_streak = 0
+        # Add to sliding window in one push
+        self.window.extend(metrics_list)
+        del self.window[: max(len(self.window) - self.window_size, 0)]
+
+        for result in results:
+            # Track anomaly persistence
+            if result.is_anomaly:
+                self.anomaly_streak += 1
+            else:
+                self.anomaly_streak = 0
 
-        # Confirm persistent anomaly
-        if self.anomaly_streak >= self.persistence_threshold:
-            result.confidence = min(result.confidence * 1.2, 1.0)
-            result.explanation = f"CONFIRMED: {result.explanation} (persisted for {self.anomaly_streak} intervals)"
+            # Confirm persistent anomaly
+            if self.anomaly_streak >= self.persistence_threshold:
+                result.confidence = min(result.confidence * 1.2, 1.0)
+                result.explanation = f"CONFIRMED: {result.explanation} (persisted for {self.anomaly_streak} intervals)"
 
-        # Store result
-        self.last_results.append(result)
-        if len(self.last_results) > self.window_size:
-            self.last_results.pop(0)
+        # Store results
+        self.last_results.extend(results)
+        del self.last_results[: max(len(self.last_results) - self.window_size, 0)]
 
-        return result
+        return results
 
     def get_trend(self) -> dict[str, Any]:
         """Get trend analysis from sliding window."""
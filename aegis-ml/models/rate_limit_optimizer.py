@@ -13,11 +13,12 @@ that balance API protection with user experience.
 """
 
 import logging
+import math
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Optional
 
 import joblib
 import numpy as np
@@ -26,6 +27,11 @@ from scipy import stats
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the numpy path is used instead
+    njit = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -49,7 +55,18 @@ class TierLevel(Enum):
     ENTERPRISE = "enterprise"
 
 
-@dataclass
+def _safe_float(value: Any) -> Optional[float]:
+    """Convert to float, returning None for NaN/Inf/None values."""
+    if value is None:
+        return None
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return None
+    return f if math.isfinite(f) else None
+
+
+@dataclass(slots=True)
 class EndpointProfile:
     """Traffic profile for an endpoint."""
 
@@ -65,34 +82,20 @@ class EndpointProfile:
     typical_burst_size: int = 0
     time_of_day_variance: float = 0.0  # How much traffic varies by time
 
-    @staticmethod
-    def _safe_float(value: Any) -> Optional[float]:
-        """Convert to float, returning None for NaN/Inf/None values."""
-        import math
-        if value is None:
-            return None
-        try:
-            f = float(value)
-            if math.isnan(f) or math.isinf(f):
-                return None
-            return f
-        except (TypeError, ValueError):
-            return None
-
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
             "endpoint": self.endpoint,
             "method": self.method,
-            "avg_requests_per_minute": self._safe_float(self.avg_requests_per_minute),
-            "peak_requests_per_minute": self._safe_float(self.peak_requests_per_minute),
-            "p95_requests_per_minute": self._safe_float(self.p95_requests_per_minute),
-            "avg_latency_ms": self._safe_float(self.avg_latency_ms),
-            "error_rate": self._safe_float(self.error_rate),
+            "avg_requests_per_minute": _safe_float(self.avg_requests_per_minute),
+            "peak_requests_per_minute": _safe_float(self.peak_requests_per_minute),
+            "p95_requests_per_minute": _safe_float(self.p95_requests_per_minute),
+            "avg_latency_ms": _safe_float(self.avg_latency_ms),
+            "error_rate": _safe_float(self.error_rate),
             "unique_users": self.unique_users,
             "total_requests": self.total_requests,
             "typical_burst_size": self.typical_burst_size,
-            "time_of_day_variance": self._safe_float(self.time_of_day_variance),
+            "time_of_day_variance": _safe_float(self.time_of_day_variance),
         }
 
 
@@ -111,20 +114,6 @@ class RateLimitRecommendation:
     warnings: list[str] = field(default_factory=list)
     profile: Optional[EndpointProfile] = None
 
-    @staticmethod
-    def _safe_float(value: Any) -> Optional[float]:
-        """Convert to float, returning None for NaN/Inf/None values."""
-        import math
-        if value is None:
-            return None
-        try:
-            f = float(value)
-            if math.isnan(f) or math.isinf(f):
-                return None
-            return f
-        except (TypeError, ValueError):
-            return None
-
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -133,7 +122,7 @@ class RateLimitRecommendation:
             "current_limit": self.current_limit,
             "recommended_limit": self.recommended_limit,
             "recommended_burst": self.recommended_burst,
-            "confidence": self._safe_float(self.confidence),
+            "confidence": _safe_float(self.confidence),
             "reasoning": self.reasoning,
             "strategy": self.strategy.value,
             "warnings": self.warnings,
@@ -156,6 +145,16 @@ class TierConfiguration:
         return int(self.base_limit * self.burst_multiplier)
 
 
+@dataclass(slots=True, frozen=True)
+class _EndpointFeatures:
+    """Values derived from an endpoint profile that do not depend on tier or strategy."""
+
+    base_limit: int
+    confidence: float
+    adaptive_multiplier: float
+    typical_burst: int
+
+
 # Default tier configurations
 DEFAULT_TIER_CONFIGS = {
     TierLevel.FREE: TierConfiguration(TierLevel.FREE, 60, 1.2, 100, 10),
@@ -167,6 +166,56 @@ DEFAULT_TIER_CONFIGS = {
     ),
 }
 
+# Upper bounds of the "nice number" bands and the step each band rounds to;
+# values at or above the last bound use the final step
+_NICE_NUMBER_BOUNDS = np.array([10.0, 50.0, 100.0, 500.0, 1000.0, 5000.0])
+_NICE_NUMBER_STEPS = np.array([1, 5, 10, 25, 50, 100, 500], dtype=np.int64)
+
+
+def _round_to_nice_numbers(values: np.ndarray) -> np.ndarray:
+    """Round an array to nice numbers, matching RateLimitOptimizer._round_to_nice_number."""
+    steps = _NICE_NUMBER_STEPS[
+        np.searchsorted(_NICE_NUMBER_BOUNDS, values, side="right")
+    ]
+    # np.rint rounds half to even, like the builtin round()
+    return np.maximum(np.rint(values / steps).astype(np.int64) * steps, 1)
+
+
+if njit is not None:  # pragma: no cover - needs numba
+
+    @njit(parallel=True, cache=True)
+    def _round_to_nice_numbers_jit(values, bounds, steps):
+        out = np.empty(values.shape[0], dtype=np.int64)
+        for i in prange(values.shape[0]):
+            step = steps[-1]
+            for j in range(bounds.shape[0]):
+                if values[i] < bounds[j]:
+                    step = steps[j]
+                    break
+            out[i] = max(1, int(np.rint(values[i] / step)) * step)
+        return out
+
+
+def _round_to_nice_number_vec(values: np.ndarray) -> np.ndarray:
+    """
+    Round many values to nice human-friendly numbers at once.
+
+    Used by batch recommendation paths. When numba is installed the rounding
+    runs in a compiled kernel; the output is identical either way.
+
+    Args:
+        values: Array of raw values
+
+    Returns:
+        int64 array of rounded values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if njit is not None:
+        return _round_to_nice_numbers_jit(
+            values, _NICE_NUMBER_BOUNDS, _NICE_NUMBER_STEPS
+        )
+    return _round_to_nice_numbers(values)
+
 
 class RateLimitOptimizer:
     """
@@ -209,6 +258,10 @@ class RateLimitOptimizer:
         # Stored profiles
         self.endpoint_profiles: dict[str, EndpointProfile] = {}
 
+        # Per-endpoint features, keyed by endpoint and tagged with the inputs
+        # they were computed from (see _feature_inputs)
+        self._feature_cache: dict[str, tuple[tuple, _EndpointFeatures]] = {}
+
         # Training state
         self.is_trained = False
         self.training_timestamp: Optional[datetime] = None
@@ -216,7 +269,6 @@ class RateLimitOptimizer:
     @staticmethod
     def _safe_value(value: Any, default: float = 0.0) -> float:
         """Safely convert a value to float, handling NaN/None/Inf."""
-        import math
         if value is None:
             return default
         try:
@@ -268,6 +320,7 @@ class RateLimitOptimizer:
             profiles[str(endpoint)] = profile
 
         self.endpoint_profiles = profiles
+        self._feature_cache.clear()
         self.is_trained = True
         self.training_timestamp = datetime.utcnow()
 
@@ -392,27 +445,132 @@ class RateLimitOptimizer:
                 endpoint, tier, current_limit, strategy
             )
 
-        # Calculate base recommendation
-        base_limit = self._calculate_base_limit(profile)
+        # Base limit and confidence are shared by every tier and strategy
+        features = self._endpoint_features(endpoint, profile)
+        recommended_limit = self._calculate_recommended_limit(features, tier, strategy)
 
-        # Apply tier multiplier
-        tier_multiplier = self._get_tier_multiplier(tier)
-        tier_adjusted_limit = int(base_limit * tier_multiplier)
+        # Calculate burst size
+        recommended_burst = self._calculate_burst_size(profile, recommended_limit)
 
-        # Apply strategy multiplier
-        strategy_multiplier = self.STRATEGY_MULTIPLIERS.get(strategy, 1.0)
+        return self._build_recommendation(
+            endpoint,
+            profile,
+            features,
+            tier,
+            current_limit,
+            strategy,
+            recommended_limit,
+            recommended_burst,
+        )
+
+    def recommend_all(
+        self,
+        tier: str = "default",
+        strategy: Optional[OptimizationStrategy] = None,
+    ) -> list[RateLimitRecommendation]:
+        """
+        Generate recommendations for all profiled endpoints.
+
+        The per-endpoint features are stacked into arrays so the tier and
+        strategy multipliers, burst bounds and rounding run once over all
+        endpoints instead of once per endpoint.
+
+        Args:
+            tier: User tier to optimize for
+            strategy: Override default optimization strategy
+
+        Returns:
+            List of recommendations for all endpoints
+        """
+        strategy = strategy or self.strategy
+        profiles = self.endpoint_profiles
+        if not profiles:
+            return []
+
+        features = [
+            self._endpoint_features(endpoint, profile)
+            for endpoint, profile in profiles.items()
+        ]
+        base_limits = np.array([f.base_limit for f in features], dtype=np.int64)
+        typical_bursts = np.array([f.typical_burst for f in features], dtype=np.int64)
+
+        # Same arithmetic as _calculate_recommended_limit; int() truncation
+        # becomes np.trunc
         if strategy == OptimizationStrategy.ADAPTIVE:
-            strategy_multiplier = self._calculate_adaptive_multiplier(profile)
+            strategy_multiplier = np.array([f.adaptive_multiplier for f in features])
+        else:
+            strategy_multiplier = self.STRATEGY_MULTIPLIERS.get(strategy, 1.0)
+        tier_adjusted = np.trunc(base_limits * self._get_tier_multiplier(tier))
+        limits = np.trunc(tier_adjusted * strategy_multiplier).astype(np.int64)
 
-        recommended_limit = int(tier_adjusted_limit * strategy_multiplier)
+        # Same bounds as _raw_burst_size
+        bursts = np.maximum(
+            np.maximum(10, limits // 6), np.minimum(typical_bursts * 2, limits)
+        )
 
-        # Calculate burst size
-        recommended_burst = self._calculate_burst_size(profile, recommended_limit)
+        recommended_limits = limits.tolist()
+        recommended_bursts = _round_to_nice_number_vec(bursts).tolist()
 
-        # Build confidence and reasoning
-        confidence = self._calculate_confidence(profile)
+        return [
+            self._build_recommendation(
+                endpoint, profile, f, tier, None, strategy, limit, burst
+            )
+            for (endpoint, profile), f, limit, burst in zip(
+                profiles.items(), features, recommended_limits, recommended_bursts
+            )
+        ]
+
+    def _endpoint_features(
+        self, endpoint: str, profile: EndpointProfile
+    ) -> _EndpointFeatures:
+        """Get the tier-independent features for an endpoint, computing them once."""
+        inputs = self._feature_inputs(profile)
+        cached = self._feature_cache.get(endpoint)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+
+        features = _EndpointFeatures(
+            base_limit=self._calculate_base_limit(profile),
+            confidence=self._calculate_confidence(profile),
+            adaptive_multiplier=self._calculate_adaptive_multiplier(profile),
+            typical_burst=int(self._safe_value(profile.typical_burst_size, 10)),
+        )
+        self._feature_cache[endpoint] = (inputs, features)
+        return features
+
+    def _feature_inputs(self, profile: EndpointProfile) -> tuple:
+        """
+        Collect every value _endpoint_features reads.
+
+        Profiles are mutable, so cached features are reused only while these
+        values are unchanged, not merely while the profile object is the same.
+        """
+        return (
+            self.headroom_percent,
+            profile.p95_requests_per_minute,
+            profile.total_requests,
+            profile.time_of_day_variance,
+            profile.error_rate,
+            profile.avg_latency_ms,
+            profile.typical_burst_size,
+        )
+
+    def _build_recommendation(
+        self,
+        endpoint: str,
+        profile: EndpointProfile,
+        features: _EndpointFeatures,
+        tier: str,
+        current_limit: Optional[int],
+        strategy: OptimizationStrategy,
+        recommended_limit: int,
+        recommended_burst: int,
+    ) -> RateLimitRecommendation:
+        """Assemble a recommendation from already-calculated limits."""
+        # Build reasoning
+        confidence = features.confidence
         reasoning = self._build_reasoning(
-            profile, base_limit, recommended_limit, strategy
+            profile, features.base_limit, recommended_limit, strategy
         )
 
         # Generate warnings
@@ -431,26 +589,6 @@ class RateLimitOptimizer:
             profile=profile,
         )
 
-    def recommend_all(
-        self,
-        tier: str = "default",
-        strategy: Optional[OptimizationStrategy] = None,
-    ) -> list[RateLimitRecommendation]:
-        """
-        Generate recommendations for all profiled endpoints.
-
-        Args:
-            tier: User tier to optimize for
-            strategy: Override default optimization strategy
-
-        Returns:
-            List of recommendations for all endpoints
-        """
-        return [
-            self.recommend(endpoint, tier, strategy=strategy)
-            for endpoint in self.endpoint_profiles
-        ]
-
     def _calculate_base_limit(self, profile: EndpointProfile) -> int:
         """Calculate base rate limit from traffic profile."""
         # Use p95 as base with headroom
@@ -464,8 +602,26 @@ class RateLimitOptimizer:
         # Round to nice numbers
         return self._round_to_nice_number(base)
 
-    def _calculate_burst_size(self, profile: EndpointProfile, rate_limit: int) -> int:
-        """Calculate recommended burst size."""
+    def _calculate_recommended_limit(
+        self,
+        features: _EndpointFeatures,
+        tier: str,
+        strategy: OptimizationStrategy,
+    ) -> int:
+        """Apply tier and strategy multipliers to an endpoint's base limit."""
+        # Apply tier multiplier
+        tier_multiplier = self._get_tier_multiplier(tier)
+        tier_adjusted_limit = int(features.base_limit * tier_multiplier)
+
+        # Apply strategy multiplier
+        strategy_multiplier = self.STRATEGY_MULTIPLIERS.get(strategy, 1.0)
+        if strategy == OptimizationStrategy.ADAPTIVE:
+            strategy_multiplier = features.adaptive_multiplier
+
+        return int(tier_adjusted_limit * strategy_multiplier)
+
+    def _raw_burst_size(self, profile: EndpointProfile, rate_limit: int) -> int:
+        """Calculate the unrounded burst size."""
         # Base burst on typical burst pattern
         typical_burst = int(self._safe_value(profile.typical_burst_size, 10))
 
@@ -476,9 +632,11 @@ class RateLimitOptimizer:
         max_burst = rate_limit
 
         # Use typical burst with bounds
-        burst = max(min_burst, min(typical_burst * 2, max_burst))
+        return max(min_burst, min(typical_burst * 2, max_burst))
 
-        return self._round_to_nice_number(burst)
+    def _calculate_burst_size(self, profile: EndpointProfile, rate_limit: int) -> int:
+        """Calculate recommended burst size."""
+        return self._round_to_nice_number(self._raw_burst_size(profile, rate_limit))
 
     def _get_tier_multiplier(self, tier: str) -> float:
         """Get multiplier for a user tier."""
@@ -747,11 +905,14 @@ class RateLimitOptimizer:
 
         return named
 
-    def save(self, path: str | Path) -> None:
-        """Save optimizer state to disk."""
-        path = Path(path)
-        path.mkdir(parents=True, exist_ok=True)
+    def save(self, path: str | Path | BinaryIO) -> None:
+        """
+        Save optimizer state to disk.
 
+        Args:
+            path: Directory path to save state files, or a writable binary
+                file object to store all components in one joblib archive
+        """
         state = {
             "strategy": self.strategy.value,
             "headroom_percent": self.headroom_percent,
@@ -763,21 +924,52 @@ class RateLimitOptimizer:
             ),
             "is_trained": self.is_trained,
         }
-
-        joblib.dump(state, path / "optimizer_state.joblib")
+        components: dict[str, Any] = {"optimizer_state": state}
 
         if self.endpoint_clusterer:
-            joblib.dump(self.endpoint_clusterer, path / "clusterer.joblib")
-            joblib.dump(self.scaler, path / "scaler.joblib")
+            components["clusterer"] = self.endpoint_clusterer
+            components["scaler"] = self.scaler
+
+        if hasattr(path, "write"):
+            joblib.dump(components, path)
+            logger.info("Optimizer state saved to file object")
+            return
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name, component in components.items():
+            joblib.dump(component, path / f"{name}.joblib")
 
         logger.info(f"Optimizer state saved to {path}")
 
     @classmethod
-    def load(cls, path: str | Path) -> "RateLimitOptimizer":
-        """Load optimizer state from disk."""
-        path = Path(path)
+    def load(cls, path: str | Path | BinaryIO) -> "RateLimitOptimizer":
+        """
+        Load optimizer state from disk.
+
+        Args:
+            path: Directory path containing state files, or a readable
+                binary file object written by save()
 
-        state = joblib.load(path / "optimizer_state.joblib")
+        Returns:
+            Loaded RateLimitOptimizer instance
+        """
+        if hasattr(path, "read"):
+            components = joblib.load(path)
+            source = "file object"
+        else:
+            path = Path(path)
+            components = {
+                "optimizer_state": joblib.load(path / "optimizer_state.joblib")
+            }
+            # Clusterer is only saved once clustering has run
+            if (path / "clusterer.joblib").exists():
+                components["clusterer"] = joblib.load(path / "clusterer.joblib")
+                components["scaler"] = joblib.load(path / "scaler.joblib")
+            source = str(path)
+
+        state = components["optimizer_state"]
 
         optimizer = cls(
             strategy=OptimizationStrategy(state["strategy"]),
@@ -808,12 +1000,11 @@ class RateLimitOptimizer:
         optimizer.is_trained = state["is_trained"]
 
         # Load clusterer if exists
-        clusterer_path = path / "clusterer.joblib"
-        if clusterer_path.exists():
-            optimizer.endpoint_clusterer = joblib.load(clusterer_path)
-            optimizer.scaler = joblib.load(path / "scaler.joblib")
+        if "clusterer" in components:
+            optimizer.endpoint_clusterer = components["clusterer"]
+            optimizer.scaler = components["scaler"]
 
-        logger.info(f"Optimizer state loaded from {path}")
+        logger.info(f"Optimizer state loaded from {source}")
 
         return optimizer
 
@@ -13,6 +13,8 @@ from .export_training_data import (
     export_endpoint_summary,
     export_hourly_patterns,
     get_data_stats,
+    run_export,
+    run_exports_concurrently,
 )
 from .generate_synthetic_data import (
     generate_aggregated_metrics,
@@ -27,6 +29,8 @@ __all__ = [
     "export_endpoint_summary",
     "export_hourly_patterns",
     "get_data_stats",
+    "run_export",
+    "run_exports_concurrently",
     # Generation functions
     "generate_request_logs",
     "generate_aggregated_metrics",
@@ -19,28 +19,53 @@ Environment Variables:
 """
 
 import argparse
+import dataclasses
+import functools
 import json
+import logging
 import os
 import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import pandas as pd
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # Configuration
 # =============================================================================
 
-DB_CONFIG = {
-    "host": os.getenv("POSTGRES_HOST", "localhost"),
-    "port": int(os.getenv("POSTGRES_PORT", "5432")),
-    "database": os.getenv("POSTGRES_DB", "aegis"),
-    "user": os.getenv("POSTGRES_USER", "aegis_user"),
-    "password": os.getenv("POSTGRES_PASSWORD", "dev_password"),
-}
+
+@dataclass(frozen=True, slots=True)
+class DBConfig:
+    """PostgreSQL connection settings."""
+
+    host: str
+    port: int
+    database: str
+    user: str
+    password: str
+
+
+@functools.cache
+def get_db_config() -> DBConfig:
+    """Read database settings from the environment (once per process)."""
+    return DBConfig(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=int(os.getenv("POSTGRES_PORT", "5432")),
+        database=os.getenv("POSTGRES_DB", "aegis"),
+        user=os.getenv("POSTGRES_USER", "aegis_user"),
+        password=os.getenv("POSTGRES_PASSWORD", "dev_password"),
+    )
+
 
 # Time bucket mapping
 BUCKET_INTERVALS = {
@@ -52,21 +77,388 @@ BUCKET_INTERVALS = {
     "1d": "1 day",
 }
 
+# Supported export types
+EXPORT_TYPES = ["aggregated", "endpoint", "endpoint-summary", "hourly"]
+
+
+# =============================================================================
+# SQL Statements
+# =============================================================================
+# Each export runs as a server-side prepared statement. Placeholders use the
+# PostgreSQL $n syntax because the text is only ever sent as a PREPARE body.
+#
+# Latency percentiles are read as one array from a single sorted pass per
+# group. With the tdigest extension installed they come from its
+# approximate (and much cheaper) digest instead; see _percentiles().
+#
+# When the bucket_stats() function from the ML init script is installed, the
+# aggregated export hands each bucket's latencies to it as one array, and all
+# latency statistics come back together as a jsonb object.
+
+_AGG_SQL = """
+    SELECT
+        time_bucket,
+        total_requests,
+        avg_latency_ms,
+        latency_pct[1]::numeric(10,2) as p50_latency_ms,
+        latency_pct[2]::numeric(10,2) as p95_latency_ms,
+        latency_pct[3]::numeric(10,2) as p99_latency_ms,
+        min_latency_ms,
+        max_latency_ms,
+        stddev_latency_ms,
+        status_2xx,
+        status_3xx,
+        status_4xx,
+        status_5xx,
+        unique_ips,
+        unique_users
+    FROM (
+        SELECT
+            date_trunc('minute', timestamp) -
+                (EXTRACT(minute FROM timestamp)::integer %
+                 EXTRACT(epoch FROM $3::interval)::integer / 60
+                ) * interval '1 minute' as time_bucket,
+            COUNT(*) as total_requests,
+            AVG(response_time_ms)::numeric(10,2) as avg_latency_ms,
+            {latency_percentiles} as latency_pct,
+            MIN(response_time_ms) as min_latency_ms,
+            MAX(response_time_ms) as max_latency_ms,
+            STDDEV(response_time_ms)::numeric(10,2) as stddev_latency_ms,
+            COUNT(*) FILTER (WHERE status_code >= 200 AND status_code < 300) as status_2xx,
+            COUNT(*) FILTER (WHERE status_code >= 300 AND status_code < 400) as status_3xx,
+            COUNT(*) FILTER (WHERE status_code >= 400 AND status_code < 500) as status_4xx,
+            COUNT(*) FILTER (WHERE status_code >= 500) as status_5xx,
+            COUNT(DISTINCT ip_address) as unique_ips,
+            COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users
+        FROM request_logs
+        WHERE timestamp >= $1 AND timestamp < $2
+        GROUP BY time_bucket
+    ) buckets
+    ORDER BY time_bucket
+"""
+
+_AGG_FUSED_SQL = """
+    SELECT
+        date_trunc('minute', timestamp) -
+            (EXTRACT(minute FROM timestamp)::integer %
+             EXTRACT(epoch FROM $3::interval)::integer / 60
+            ) * interval '1 minute' as time_bucket,
+        COUNT(*) as total_requests,
+        bucket_stats(array_agg(response_time_ms::numeric)) as stats,
+        COUNT(*) FILTER (WHERE status_code >= 200 AND status_code < 300) as status_2xx,
+        COUNT(*) FILTER (WHERE status_code >= 300 AND status_code < 400) as status_3xx,
+        COUNT(*) FILTER (WHERE status_code >= 400 AND status_code < 500) as status_4xx,
+        COUNT(*) FILTER (WHERE status_code >= 500) as status_5xx,
+        COUNT(DISTINCT ip_address) as unique_ips,
+        COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users
+    FROM request_logs
+    WHERE timestamp >= $1 AND timestamp < $2
+    GROUP BY time_bucket
+    ORDER BY time_bucket
+"""
+
+_EP_SQL = """
+    SELECT
+        timestamp,
+        path as endpoint,
+        method,
+        response_time_ms,
+        status_code,
+        user_id,
+        ip_address,
+        backend_name,
+        request_id
+    FROM request_logs
+    WHERE timestamp >= $1 AND timestamp < $2
+    ORDER BY timestamp
+"""
+
+_EP_SUMMARY_SQL = """
+    WITH endpoint_stats AS (
+        SELECT
+            path as endpoint,
+            method,
+            COUNT(*) as total_requests,
+            AVG(response_time_ms)::numeric(10,2) as avg_latency_ms,
+            {latency_percentiles} as latency_pct,
+            COUNT(*) FILTER (WHERE status_code >= 400)::float / NULLIF(COUNT(*), 0) as error_rate,
+            COUNT(DISTINCT ip_address) as unique_ips,
+            COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users,
+            MIN(timestamp) as first_request,
+            MAX(timestamp) as last_request
+        FROM request_logs
+        WHERE timestamp >= $1 AND timestamp < $2
+        GROUP BY path, method
+    ),
+    minute_stats AS (
+        SELECT
+            path as endpoint,
+            method,
+            date_trunc('minute', timestamp) as minute,
+            COUNT(*) as requests_per_minute
+        FROM request_logs
+        WHERE timestamp >= $1 AND timestamp < $2
+        GROUP BY path, method, minute
+    ),
+    rpm_stats AS (
+        SELECT
+            endpoint,
+            method,
+            AVG(requests_per_minute)::numeric(10,2) as avg_rpm,
+            MAX(requests_per_minute) as peak_rpm,
+            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY requests_per_minute)::numeric(10,2) as p95_rpm,
+            STDDEV(requests_per_minute)::numeric(10,2) as stddev_rpm
+        FROM minute_stats
+        GROUP BY endpoint, method
+    )
+    SELECT
+        e.endpoint,
+        e.method,
+        e.total_requests,
+        e.avg_latency_ms,
+        e.latency_pct[1]::numeric(10,2) as p95_latency_ms,
+        e.latency_pct[2]::numeric(10,2) as p99_latency_ms,
+        e.error_rate,
+        e.unique_ips,
+        e.unique_users,
+        e.first_request,
+        e.last_request,
+        r.avg_rpm,
+        r.peak_rpm,
+        r.p95_rpm,
+        r.stddev_rpm,
+        EXTRACT(epoch FROM (e.last_request - e.first_request)) / 3600 as active_hours
+    FROM endpoint_stats e
+    LEFT JOIN rpm_stats r ON e.endpoint = r.endpoint AND e.method = r.method
+    ORDER BY e.total_requests DESC
+"""
+
+_HOURLY_SQL = """
+    SELECT
+        EXTRACT(dow FROM timestamp) as day_of_week,
+        EXTRACT(hour FROM timestamp) as hour_of_day,
+        COUNT(*) as total_requests,
+        AVG(response_time_ms)::numeric(10,2) as avg_latency_ms,
+        COUNT(*) FILTER (WHERE status_code >= 400)::float / NULLIF(COUNT(*), 0) as error_rate
+    FROM request_logs
+    WHERE timestamp >= $1 AND timestamp < $2
+    GROUP BY day_of_week, hour_of_day
+    ORDER BY day_of_week, hour_of_day
+"""
+
+_STATS_SQL = """
+    SELECT
+        COUNT(*) as total_records,
+        MIN(timestamp) as earliest_record,
+        MAX(timestamp) as latest_record,
+        COUNT(DISTINCT path) as unique_endpoints,
+        COUNT(DISTINCT ip_address) as unique_ips,
+        COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users
+    FROM request_logs
+    WHERE timestamp >= $1 AND timestamp < $2
+"""
+
+
+def _percentiles(column: str, fractions: str, approximate: bool = False) -> str:
+    """Build an expression returning an array of percentiles of a column."""
+    if approximate:
+        return f"tdigest_percentile({column}, 100, ARRAY[{fractions}]::float8[])"
+    return f"PERCENTILE_CONT(ARRAY[{fractions}]) WITHIN GROUP (ORDER BY {column})"
+
+
+_RANGE_PARAMS = ("timestamptz", "timestamptz")
+_AGG_PARAMS = ("timestamptz", "timestamptz", "interval")
+_AGG_FRACTIONS = "0.50, 0.95, 0.99"
+_EP_SUMMARY_FRACTIONS = "0.95, 0.99"
+
+# Statement name -> (SQL, parameter types)
+PREPARED_STATEMENTS = {
+    "agg_metrics": (
+        _AGG_SQL.format(
+            latency_percentiles=_percentiles("response_time_ms", _AGG_FRACTIONS)
+        ),
+        _AGG_PARAMS,
+    ),
+    "agg_metrics_tdigest": (
+        _AGG_SQL.format(
+            latency_percentiles=_percentiles(
+                "response_time_ms", _AGG_FRACTIONS, approximate=True
+            )
+        ),
+        _AGG_PARAMS,
+    ),
+    "agg_metrics_fused": (_AGG_FUSED_SQL, _AGG_PARAMS),
+    "endpoint_metrics": (_EP_SQL, _RANGE_PARAMS),
+    "endpoint_summary": (
+        _EP_SUMMARY_SQL.format(
+            latency_percentiles=_percentiles("response_time_ms", _EP_SUMMARY_FRACTIONS)
+        ),
+        _RANGE_PARAMS,
+    ),
+    "endpoint_summary_tdigest": (
+        _EP_SUMMARY_SQL.format(
+            latency_percentiles=_percentiles(
+                "response_time_ms", _EP_SUMMARY_FRACTIONS, approximate=True
+            )
+        ),
+        _RANGE_PARAMS,
+    ),
+    "hourly_patterns": (_HOURLY_SQL, _RANGE_PARAMS),
+    "data_stats": (_STATS_SQL, _RANGE_PARAMS),
+}
+
+# Server feature -> query checking whether it is installed
+SERVER_FEATURES = {
+    "tdigest": "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'tdigest')",
+    "bucket_stats": "SELECT to_regprocedure('bucket_stats(numeric[])') IS NOT NULL",
+}
+
+# Variants used in place of a statement when the server supports them, in
+# order of preference: (variant name, required feature)
+STATEMENT_VARIANTS = {
+    "agg_metrics": [
+        ("agg_metrics_tdigest", "tdigest"),
+        ("agg_metrics_fused", "bucket_stats"),
+    ],
+    "endpoint_summary": [("endpoint_summary_tdigest", "tdigest")],
+}
+
+# Latency statistics returned by bucket_stats(), in export column order
+BUCKET_STATS = ["avg", "p50", "p95", "p99", "min", "max", "stddev"]
+
+# Column dtypes applied as each export is loaded. Timestamps are cast straight
+# to a contiguous datetime64 column instead of being parsed per row.
+TIMESTAMP_DTYPE = "datetime64[us, UTC]"
+
+EXPORT_DTYPES = {
+    "agg_metrics": {"time_bucket": TIMESTAMP_DTYPE},
+    # Raw request rows repeat a handful of endpoint/method/backend strings
+    # millions of times; categoricals store each distinct value once
+    "endpoint_metrics": {
+        "timestamp": TIMESTAMP_DTYPE,
+        "endpoint": "category",
+        "method": "category",
+        "backend_name": "category",
+    },
+    "endpoint_summary": {
+        "first_request": TIMESTAMP_DTYPE,
+        "last_request": TIMESTAMP_DTYPE,
+    },
+    # EXTRACT() is computed server-side; the values fit in a single byte
+    "hourly_patterns": {"day_of_week": "int8", "hour_of_day": "int8"},
+}
+
+# Variants return the same columns as the statement they stand in for
+EXPORT_DTYPES.update(
+    {
+        variant: EXPORT_DTYPES[name]
+        for name, variants in STATEMENT_VARIANTS.items()
+        for variant, _ in variants
+    }
+)
+
+# Connections on which each statement has already been prepared. Prepared
+# statements live as long as the server session, so a connection that is
+# reused across exports only pays the parse/plan cost once.
+_prepared_connections: dict[str, "weakref.WeakSet"] = {
+    name: weakref.WeakSet() for name in PREPARED_STATEMENTS
+}
+
+# Which SERVER_FEATURES are installed, per connection
+_server_features: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
 
 # =============================================================================
 # Database Functions
 # =============================================================================
 
 
-def get_connection():
-    """Get database connection."""
-    return psycopg2.connect(**DB_CONFIG)
+def get_connection(db_config: Optional[DBConfig] = None):
+    """Get database connection (default: settings from the environment)."""
+    return psycopg2.connect(**dataclasses.asdict(db_config or get_db_config()))
+
+
+@contextmanager
+def _connection(conn=None, db_config: Optional[DBConfig] = None) -> Iterator:
+    """Use the given connection, or open (and close) a new one."""
+    if conn is not None:
+        yield conn
+        return
+
+    conn = get_connection(db_config)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _has_feature(conn, feature: str) -> bool:
+    """Check (once per connection) whether a server feature is installed."""
+    features = _server_features.setdefault(conn, {})
+    if feature not in features:
+        with conn.cursor() as cur:
+            cur.execute(SERVER_FEATURES[feature])
+            features[feature] = bool(cur.fetchone()[0])
+    return features[feature]
+
+
+def _resolve_statement(conn, name: str) -> str:
+    """Pick the preferred variant of a statement the server supports."""
+    for variant, feature in STATEMENT_VARIANTS.get(name, []):
+        if _has_feature(conn, feature):
+            return variant
+    return name
+
+
+def _prepare(conn, name: str) -> str:
+    """
+    Prepare a statement on the connection if it isn't already.
+
+    Statements with variants (see STATEMENT_VARIANTS) use the first one the
+    server supports, and fall back to the plain statement otherwise.
+
+    Returns:
+        The EXECUTE statement to run with the statement's parameters
+    """
+    name = _resolve_statement(conn, name)
+
+    sql, param_types = PREPARED_STATEMENTS[name]
+    prepared = _prepared_connections[name]
+
+    if conn not in prepared:
+        with conn.cursor() as cur:
+            cur.execute(f"PREPARE {name}({', '.join(param_types)}) AS {sql}")
+        prepared.add(conn)
+
+    return f"EXECUTE {name}({', '.join(['%s'] * len(param_types))})"
+
+
+def _read_prepared(conn, name: str, params: tuple) -> pd.DataFrame:
+    """Run a prepared statement and load the result into a DataFrame."""
+    dtype = EXPORT_DTYPES.get(_resolve_statement(conn, name))
+    return pd.read_sql_query(_prepare(conn, name), conn, params=params, dtype=dtype)
+
+
+def _expand_bucket_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand the jsonb stats column of the fused aggregated query.
+
+    The latency columns are placed after total_requests, matching the
+    column order of the plain query.
+    """
+    stats = pd.json_normalize(df.pop("stats").tolist())
+    stats = stats.reindex(columns=BUCKET_STATS).add_suffix("_latency_ms")
+    stats.index = df.index
+
+    position = df.columns.get_loc("total_requests") + 1
+    return pd.concat([df.iloc[:, :position], stats, df.iloc[:, position:]], axis=1)
 
 
 def export_aggregated_metrics(
     start_date: datetime,
     end_date: datetime,
     bucket: str = "1m",
+    conn=None,
 ) -> pd.DataFrame:
     """
     Export aggregated metrics suitable for anomaly detection training.
@@ -75,41 +467,17 @@ def export_aggregated_metrics(
         start_date: Start of time range
         end_date: End of time range
         bucket: Time bucket interval (1m, 5m, 15m, 1h, 6h, 1d)
+        conn: Optional open connection to reuse (default: open a new one)
 
     Returns:
         DataFrame with aggregated metrics
     """
     interval = BUCKET_INTERVALS.get(bucket, "1 minute")
 
-    query = f"""
-        SELECT
-            date_trunc('minute', timestamp) -
-                (EXTRACT(minute FROM timestamp)::integer %
-                 EXTRACT(epoch FROM INTERVAL '{interval}')::integer / 60
-                ) * interval '1 minute' as time_bucket,
-            COUNT(*) as total_requests,
-            AVG(response_time_ms)::numeric(10,2) as avg_latency_ms,
-            PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY response_time_ms)::numeric(10,2) as p50_latency_ms,
-            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY response_time_ms)::numeric(10,2) as p95_latency_ms,
-            PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY response_time_ms)::numeric(10,2) as p99_latency_ms,
-            MIN(response_time_ms) as min_latency_ms,
-            MAX(response_time_ms) as max_latency_ms,
-            STDDEV(response_time_ms)::numeric(10,2) as stddev_latency_ms,
-            COUNT(*) FILTER (WHERE status_code >= 200 AND status_code < 300) as status_2xx,
-            COUNT(*) FILTER (WHERE status_code >= 300 AND status_code < 400) as status_3xx,
-            COUNT(*) FILTER (WHERE status_code >= 400 AND status_code < 500) as status_4xx,
-            COUNT(*) FILTER (WHERE status_code >= 500) as status_5xx,
-            COUNT(DISTINCT ip_address) as unique_ips,
-            COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users
-        FROM request_logs
-        WHERE timestamp >= %s AND timestamp < %s
-        GROUP BY time_bucket
-        ORDER BY time_bucket
-    """
-
-    conn = get_connection()
-    try:
-        df = pd.read_sql_query(query, conn, params=(start_date, end_date))
+    with _connection(conn) as conn:
+        df = _read_prepared(conn, "agg_metrics", (start_date, end_date, interval))
+        if "stats" in df.columns:
+            df = _expand_bucket_stats(df)
 
         # Calculate derived metrics
         if not df.empty:
@@ -131,13 +499,12 @@ def export_aggregated_metrics(
             df["success_rate"] = df["status_2xx"] / df["total_requests"].replace(0, 1)
 
         return df
-    finally:
-        conn.close()
 
 
 def export_endpoint_metrics(
     start_date: datetime,
     end_date: datetime,
+    conn=None,
 ) -> pd.DataFrame:
     """
     Export per-endpoint metrics for rate limit optimization.
@@ -145,36 +512,19 @@ def export_endpoint_metrics(
     Args:
         start_date: Start of time range
         end_date: End of time range
+        conn: Optional open connection to reuse (default: open a new one)
 
     Returns:
         DataFrame with per-endpoint metrics
     """
-    query = """
-        SELECT
-            timestamp,
-            path as endpoint,
-            method,
-            response_time_ms,
-            status_code,
-            user_id,
-            ip_address,
-            backend_name,
-            request_id
-        FROM request_logs
-        WHERE timestamp >= %s AND timestamp < %s
-        ORDER BY timestamp
-    """
-
-    conn = get_connection()
-    try:
-        return pd.read_sql_query(query, conn, params=(start_date, end_date))
-    finally:
-        conn.close()
+    with _connection(conn) as conn:
+        return _read_prepared(conn, "endpoint_metrics", (start_date, end_date))
 
 
 def export_endpoint_summary(
     start_date: datetime,
     end_date: datetime,
+    conn=None,
 ) -> pd.DataFrame:
     """
     Export endpoint-level summary statistics.
@@ -182,73 +532,19 @@ def export_endpoint_summary(
     Args:
         start_date: Start of time range
         end_date: End of time range
+        conn: Optional open connection to reuse (default: open a new one)
 
     Returns:
         DataFrame with endpoint summaries
     """
-    query = """
-        WITH endpoint_stats AS (
-            SELECT
-                path as endpoint,
-                method,
-                COUNT(*) as total_requests,
-                AVG(response_time_ms)::numeric(10,2) as avg_latency_ms,
-                PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY response_time_ms)::numeric(10,2) as p95_latency_ms,
-                PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY response_time_ms)::numeric(10,2) as p99_latency_ms,
-                COUNT(*) FILTER (WHERE status_code >= 400)::float / NULLIF(COUNT(*), 0) as error_rate,
-                COUNT(DISTINCT ip_address) as unique_ips,
-                COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users,
-                MIN(timestamp) as first_request,
-                MAX(timestamp) as last_request
-            FROM request_logs
-            WHERE timestamp >= %s AND timestamp < %s
-            GROUP BY path, method
-        ),
-        minute_stats AS (
-            SELECT
-                path as endpoint,
-                method,
-                date_trunc('minute', timestamp) as minute,
-                COUNT(*) as requests_per_minute
-            FROM request_logs
-            WHERE timestamp >= %s AND timestamp < %s
-            GROUP BY path, method, minute
-        ),
-        rpm_stats AS (
-            SELECT
-                endpoint,
-                method,
-                AVG(requests_per_minute)::numeric(10,2) as avg_rpm,
-                MAX(requests_per_minute) as peak_rpm,
-                PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY requests_per_minute)::numeric(10,2) as p95_rpm,
-                STDDEV(requests_per_minute)::numeric(10,2) as stddev_rpm
-            FROM minute_stats
-            GROUP BY endpoint, method
-        )
-        SELECT
-            e.*,
-            r.avg_rpm,
-            r.peak_rpm,
-            r.p95_rpm,
-            r.stddev_rpm,
-            EXTRACT(epoch FROM (e.last_request - e.first_request)) / 3600 as active_hours
-        FROM endpoint_stats e
-        LEFT JOIN rpm_stats r ON e.endpoint = r.endpoint AND e.method = r.method
-        ORDER BY e.total_requests DESC
-    """
-
-    conn = get_connection()
-    try:
-        return pd.read_sql_query(
-            query, conn, params=(start_date, end_date, start_date, end_date)
-        )
-    finally:
-        conn.close()
+    with _connection(conn) as conn:
+        return _read_prepared(conn, "endpoint_summary", (start_date, end_date))
 
 
 def export_hourly_patterns(
     start_date: datetime,
     end_date: datetime,
+    conn=None,
 ) -> pd.DataFrame:
     """
     Export hourly traffic patterns for time-of-day analysis.
@@ -256,61 +552,101 @@ def export_hourly_patterns(
     Args:
         start_date: Start of time range
         end_date: End of time range
+        conn: Optional open connection to reuse (default: open a new one)
 
     Returns:
         DataFrame with hourly patterns
     """
-    query = """
-        SELECT
-            EXTRACT(dow FROM timestamp) as day_of_week,
-            EXTRACT(hour FROM timestamp) as hour_of_day,
-            COUNT(*) as total_requests,
-            AVG(response_time_ms)::numeric(10,2) as avg_latency_ms,
-            COUNT(*) FILTER (WHERE status_code >= 400)::float / NULLIF(COUNT(*), 0) as error_rate
-        FROM request_logs
-        WHERE timestamp >= %s AND timestamp < %s
-        GROUP BY day_of_week, hour_of_day
-        ORDER BY day_of_week, hour_of_day
-    """
-
-    conn = get_connection()
-    try:
-        return pd.read_sql_query(query, conn, params=(start_date, end_date))
-    finally:
-        conn.close()
+    with _connection(conn) as conn:
+        return _read_prepared(conn, "hourly_patterns", (start_date, end_date))
 
 
-def get_data_stats(start_date: datetime, end_date: datetime) -> dict:
+def get_data_stats(start_date: datetime, end_date: datetime, conn=None) -> dict:
     """
     Get statistics about available data in the time range.
 
     Args:
         start_date: Start of time range
         end_date: End of time range
+        conn: Optional open connection to reuse (default: open a new one)
 
     Returns:
         Dictionary with data statistics
     """
-    query = """
-        SELECT
-            COUNT(*) as total_records,
-            MIN(timestamp) as earliest_record,
-            MAX(timestamp) as latest_record,
-            COUNT(DISTINCT path) as unique_endpoints,
-            COUNT(DISTINCT ip_address) as unique_ips,
-            COUNT(DISTINCT user_id) FILTER (WHERE user_id IS NOT NULL) as unique_users
-        FROM request_logs
-        WHERE timestamp >= %s AND timestamp < %s
-    """
-
-    conn = get_connection()
-    try:
+    with _connection(conn) as conn:
+        execute = _prepare(conn, "data_stats")
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, (start_date, end_date))
+            cur.execute(execute, (start_date, end_date))
             result = cur.fetchone()
             return dict(result) if result else {}
-    finally:
-        conn.close()
+
+
+def run_export(
+    export_type: str,
+    start_date: datetime,
+    end_date: datetime,
+    bucket: str = "1m",
+    conn=None,
+) -> pd.DataFrame:
+    """
+    Run a single export by type name.
+
+    Args:
+        export_type: One of EXPORT_TYPES
+        start_date: Start of time range
+        end_date: End of time range
+        bucket: Time bucket interval for aggregated data
+        conn: Optional open connection to reuse (default: open a new one)
+
+    Returns:
+        DataFrame with the exported data
+    """
+    if export_type == "aggregated":
+        return export_aggregated_metrics(start_date, end_date, bucket, conn)
+    elif export_type == "endpoint":
+        return export_endpoint_metrics(start_date, end_date, conn)
+    elif export_type == "endpoint-summary":
+        return export_endpoint_summary(start_date, end_date, conn)
+    elif export_type == "hourly":
+        return export_hourly_patterns(start_date, end_date, conn)
+    else:
+        raise ValueError(f"Unknown export type: {export_type}")
+
+
+def run_exports_concurrently(
+    export_types: list[str],
+    start_date: datetime,
+    end_date: datetime,
+    bucket: str = "1m",
+    db_config: Optional[DBConfig] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Run several exports at once, each on its own connection.
+
+    psycopg2 releases the GIL while waiting on the server, so the queries
+    execute in parallel and the total time is roughly that of the slowest.
+
+    Args:
+        export_types: Export types to run
+        start_date: Start of time range
+        end_date: End of time range
+        bucket: Time bucket interval for aggregated data
+        db_config: Database settings (default: settings from the environment)
+
+    Returns:
+        Dictionary mapping export type to its DataFrame
+    """
+
+    def export_one(export_type: str) -> pd.DataFrame:
+        with _connection(db_config=db_config) as conn:
+            return run_export(export_type, start_date, end_date, bucket, conn)
+
+    with ThreadPoolExecutor(max_workers=len(export_types)) as executor:
+        futures = {
+            export_type: executor.submit(export_one, export_type)
+            for export_type in export_types
+        }
+        return {export_type: f.result() for export_type, f in futures.items()}
 
 
 # =============================================================================
@@ -348,11 +684,38 @@ def save_dataframe(df: pd.DataFrame, output_path: str, format_type: str) -> None
     elif format_type == "json":
         df.to_json(path, orient="records", date_format="iso", indent=2)
     elif format_type == "parquet":
-        df.to_parquet(path, index=False)
+        # Keep categorical columns dictionary-encoded in each row group
+        df.to_parquet(path, index=False, use_dictionary=True)
     else:
         raise ValueError(f"Unknown format: {format_type}")
 
-    print(f"Saved {len(df)} records to {path}")
+    logger.info(f"Saved {len(df)} records to {path}")
+
+
+def parse_export_types(value: str) -> list[str]:
+    """Parse a comma-separated list of export types."""
+    export_types = [t.strip() for t in value.split(",") if t.strip()]
+    unknown = [t for t in export_types if t not in EXPORT_TYPES]
+
+    if not export_types or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid export type(s): {', '.join(unknown) or value!r} "
+            f"(choose from {', '.join(EXPORT_TYPES)})"
+        )
+
+    # Drop duplicates, keeping the order given
+    return list(dict.fromkeys(export_types))
+
+
+def get_output_path(
+    output_path: Optional[str], export_type: str, format_type: str
+) -> str:
+    """Derive a per-type output path when exporting several types."""
+    if not output_path:
+        return f"training_data_{export_type}.{format_type}"
+
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}_{export_type}{path.suffix}"))
 
 
 def parse_date(date_str: str) -> datetime:
@@ -396,6 +759,9 @@ Examples:
     # Export endpoint summary
     python export_training_data.py --days 7 --type endpoint-summary --output endpoints.csv
 
+    # Export several types concurrently (writes data_aggregated.csv, ...)
+    python export_training_data.py --days 7 --type aggregated,endpoint-summary,hourly --output data.csv
+
     # Export as JSON
     python export_training_data.py --days 7 --format json --output data.json
         """,
@@ -424,10 +790,13 @@ Examples:
     # Data type arguments
     parser.add_argument(
         "--type",
-        type=str,
-        choices=["aggregated", "endpoint", "endpoint-summary", "hourly"],
-        default="aggregated",
-        help="Type of data to export (default: aggregated)",
+        type=parse_export_types,
+        default=["aggregated"],
+        help=(
+            "Type of data to export: aggregated, endpoint, endpoint-summary, "
+            "hourly. Separate several with commas to export them "
+            "concurrently (default: aggregated)"
+        ),
     )
 
     parser.add_argument(
@@ -497,17 +866,19 @@ Examples:
 
     args = parser.parse_args()
 
+    # Progress goes to stderr so stdout stays clean for data dumps
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Override database config from arguments
-    if args.db_host:
-        DB_CONFIG["host"] = args.db_host
-    if args.db_port:
-        DB_CONFIG["port"] = args.db_port
-    if args.db_name:
-        DB_CONFIG["database"] = args.db_name
-    if args.db_user:
-        DB_CONFIG["user"] = args.db_user
-    if args.db_password:
-        DB_CONFIG["password"] = args.db_password
+    env_config = get_db_config()
+    db_config = dataclasses.replace(
+        env_config,
+        host=args.db_host or env_config.host,
+        port=args.db_port or env_config.port,
+        database=args.db_name or env_config.database,
+        user=args.db_user or env_config.user,
+        password=args.db_password or env_config.password,
+    )
 
     # Calculate time range
     if args.start:
@@ -517,73 +888,101 @@ Examples:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=args.days)
 
-    print(f"Time range: {start_date} to {end_date}")
-    print(f"Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+    logger.info(f"Time range: {start_date} to {end_date}")
+    logger.info(f"Database: {db_config.host}:{db_config.port}/{db_config.database}")
 
-    # Get and display stats
-    if args.stats or args.dry_run:
-        try:
-            stats = get_data_stats(start_date, end_date)
-            print("\nData Statistics:")
-            print(f"  Total records: {stats.get('total_records', 0):,}")
-            print(f"  Earliest record: {stats.get('earliest_record', 'N/A')}")
-            print(f"  Latest record: {stats.get('latest_record', 'N/A')}")
-            print(f"  Unique endpoints: {stats.get('unique_endpoints', 0):,}")
-            print(f"  Unique IPs: {stats.get('unique_ips', 0):,}")
-            print(f"  Unique users: {stats.get('unique_users', 0):,}")
-
-            if stats.get("total_records", 0) == 0:
-                print("\nNo data found in the specified time range.")
-                sys.exit(1)
-        except Exception as e:
-            print(f"\nError getting statistics: {e}")
-            sys.exit(1)
+    # One connection for the whole run so statements are prepared only once
+    try:
+        conn = get_connection(db_config)
+    except psycopg2.Error as e:
+        logger.error(f"Database error: {e}")
+        sys.exit(1)
 
-    if args.dry_run:
-        print("\nDry run complete. No data exported.")
-        sys.exit(0)
+    # Closed however the run exits, including the sys.exit() paths
+    with closing(conn):
+        # Get and display stats
+        if args.stats or args.dry_run:
+            try:
+                stats = get_data_stats(start_date, end_date, conn)
+                logger.info("Data Statistics:")
+                logger.info(f"  Total records: {stats.get('total_records', 0):,}")
+                logger.info(f"  Earliest record: {stats.get('earliest_record', 'N/A')}")
+                logger.info(f"  Latest record: {stats.get('latest_record', 'N/A')}")
+                logger.info(f"  Unique endpoints: {stats.get('unique_endpoints', 0):,}")
+                logger.info(f"  Unique IPs: {stats.get('unique_ips', 0):,}")
+                logger.info(f"  Unique users: {stats.get('unique_users', 0):,}")
+
+                if stats.get("total_records", 0) == 0:
+                    logger.error("No data found in the specified time range.")
+                    sys.exit(1)
+            except Exception as e:
+                logger.error(f"Error getting statistics: {e}")
+                sys.exit(1)
 
-    # Export data
-    try:
-        print(f"\nExporting {args.type} data...")
-
-        if args.type == "aggregated":
-            df = export_aggregated_metrics(start_date, end_date, args.bucket)
-        elif args.type == "endpoint":
-            df = export_endpoint_metrics(start_date, end_date)
-        elif args.type == "endpoint-summary":
-            df = export_endpoint_summary(start_date, end_date)
-        elif args.type == "hourly":
-            df = export_hourly_patterns(start_date, end_date)
-        else:
-            raise ValueError(f"Unknown export type: {args.type}")
-
-        if df.empty:
-            print("No data found for the specified criteria.")
-            sys.exit(1)
+        if args.dry_run:
+            logger.info("Dry run complete. No data exported.")
+            sys.exit(0)
 
-        print(f"Exported {len(df)} records")
-
-        # Save or print output
-        if args.output:
-            save_dataframe(df, args.output, args.format)
-        else:
-            # Print to stdout
-            if args.format == "csv":
-                print("\n" + df.to_csv(index=False))
-            elif args.format == "json":
-                print("\n" + df.to_json(orient="records", date_format="iso", indent=2))
+        # Export data
+        try:
+            logger.info(f"Exporting {', '.join(args.type)} data...")
+
+            if len(args.type) == 1:
+                export_type = args.type[0]
+                df = run_export(export_type, start_date, end_date, args.bucket, conn)
+
+                if df.empty:
+                    logger.error("No data found for the specified criteria.")
+                    sys.exit(1)
+
+                logger.info(f"Exported {len(df)} records")
+
+                # Save or print output
+                if args.output:
+                    save_dataframe(df, args.output, args.format)
+                else:
+                    # Write straight to the stdout byte stream rather than
+                    # building the whole document as one string first
+                    sys.stdout.flush()
+                    if args.format == "csv":
+                        df.to_csv(sys.stdout.buffer, index=False)
+                    elif args.format == "json":
+                        df.to_json(
+                            sys.stdout.buffer,
+                            orient="records",
+                            date_format="iso",
+                            indent=2,
+                        )
+                        sys.stdout.buffer.write(b"\n")
+                    else:
+                        # For parquet, we need a file
+                        output_path = f"training_data_{export_type}.parquet"
+                        save_dataframe(df, output_path, args.format)
             else:
-                # For parquet, we need a file
-                output_path = f"training_data_{args.type}.parquet"
-                save_dataframe(df, output_path, args.format)
-
-    except psycopg2.Error as e:
-        print(f"\nDatabase error: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\nError: {e}")
-        sys.exit(1)
+                results = run_exports_concurrently(
+                    args.type, start_date, end_date, args.bucket, db_config
+                )
+
+                if all(df.empty for df in results.values()):
+                    logger.error("No data found for the specified criteria.")
+                    sys.exit(1)
+
+                # Several exports always go to per-type files
+                for export_type, df in results.items():
+                    if df.empty:
+                        logger.warning(f"No {export_type} data found, skipping.")
+                        continue
+
+                    logger.info(f"Exported {len(df)} {export_type} records")
+                    output_path = get_output_path(args.output, export_type, args.format)
+                    save_dataframe(df, output_path, args.format)
+
+        except psycopg2.Error as e:
+            logger.error(f"Database error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            logger.error(f"Error: {e}")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
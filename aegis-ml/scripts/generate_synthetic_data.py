@@ -24,16 +24,25 @@ Environment Variables:
 """
 
 import argparse
+import io
+import multiprocessing
 import os
 import sys
-import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, Union
 
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the numpy paths are used instead
+    njit = None
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -46,6 +55,9 @@ DB_CONFIG = {
     "password": os.getenv("POSTGRES_PASSWORD", "dev_password"),
 }
 
+# Random seed, or a SeedSequence spawned for one shard of a larger run
+SeedLike = Union[int, np.random.SeedSequence]
+
 # Endpoint configurations with different traffic characteristics
 ENDPOINT_CONFIGS = [
     {
@@ -137,13 +149,22 @@ USER_AGENTS = [
     "PostmanRuntime/7.29.0",
 ]
 
+# Status codes and their cumulative probabilities. Errors are 70% client
+# errors and 30% server errors, each class spread evenly over its codes.
+SUCCESS_STATUS_CODES = np.array([200, 201, 204], dtype=np.int16)
+SUCCESS_STATUS_CUM_P = np.cumsum([0.85, 0.10, 0.05])
+ERROR_STATUS_CODES = np.array(
+    [400, 401, 403, 404, 422, 500, 502, 503, 504], dtype=np.int16
+)
+ERROR_STATUS_CUM_P = np.cumsum([0.7 / 5] * 5 + [0.3 / 4] * 4)
+
 
 # =============================================================================
 # Traffic Pattern Functions
 # =============================================================================
 
 
-def daily_pattern(hour: int) -> float:
+def _compute_daily_pattern(hour: int) -> float:
     """
     Generate daily traffic pattern multiplier.
 
@@ -176,7 +197,7 @@ def daily_pattern(hour: int) -> float:
         return 0.5 - 0.3 * ((hour - 20) / 4)
 
 
-def weekly_pattern(day_of_week: int) -> float:
+def _compute_weekly_pattern(day_of_week: int) -> float:
     """
     Generate weekly traffic pattern multiplier.
 
@@ -191,18 +212,159 @@ def weekly_pattern(day_of_week: int) -> float:
         return 0.4 if day_of_week == 5 else 0.3  # Saturday vs Sunday
 
 
-def generate_traffic_multiplier(timestamp: datetime) -> float:
+# The patterns only depend on the hour (0-23) and weekday (0-6), so they are
+# evaluated once here and looked up afterwards
+_DAILY = np.array([_compute_daily_pattern(h) for h in range(24)])
+_WEEKLY = np.array([_compute_weekly_pattern(d) for d in range(7)])
+
+
+def daily_pattern(hour: int) -> float:
+    """Daily traffic pattern multiplier for an hour of the day (0-23)."""
+    return _DAILY[hour]
+
+
+def weekly_pattern(day_of_week: int) -> float:
+    """Weekly traffic pattern multiplier for a weekday (0 = Monday)."""
+    return _WEEKLY[day_of_week]
+
+
+def generate_traffic_multiplier(
+    timestamp: datetime, rng: Optional[np.random.Generator] = None
+) -> float:
     """Generate combined traffic multiplier for a timestamp."""
-    hour = timestamp.hour
-    day_of_week = timestamp.weekday()
+    times = np.array([timestamp], dtype="datetime64[us]")
+    return float(generate_traffic_multiplier_vec(times, rng=rng)[0])
+
+
+def generate_traffic_multiplier_vec(
+    times: np.ndarray,
+    noise: bool = True,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Generate combined traffic multipliers for an array of timestamps.
+
+    Hour of day and weekday are derived with integer arithmetic on the
+    epoch seconds and looked up in the pattern tables.
+
+    Args:
+        times: Array of datetime64 timestamps
+        noise: Whether to add random noise (default: True)
+        rng: Random generator for the noise (default: a fresh one)
+
+    Returns:
+        Array of multipliers, one per timestamp
+    """
+    seconds = np.asarray(times, dtype="datetime64[s]").view(np.int64)
+    hours = (seconds // 3600) % 24
+    # The epoch (1970-01-01) was a Thursday, weekday 3 with Monday = 0
+    weekdays = (seconds // 86400 + 3) % 7
+
+    multipliers = _DAILY[hours] * _WEEKLY[weekdays]
+    if noise:
+        # Add some random noise
+        rng = rng if rng is not None else np.random.default_rng()
+        multipliers *= rng.normal(1.0, 0.1, len(multipliers))
+
+    return np.maximum(0.1, multipliers)
+
+
+# =============================================================================
+# Status Code Generation
+# =============================================================================
+
+
+def sample_status_codes(
+    codes: np.ndarray, cumulative_p: np.ndarray, n: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Draw n status codes from a table of codes and cumulative probabilities.
+
+    Uses a single uniform draw, mapped onto the table with searchsorted.
+    """
+    idx = np.searchsorted(cumulative_p, rng.random(n), side="right")
+    # Guard against the cumulative sum falling just short of 1.0
+    return codes[np.minimum(idx, len(codes) - 1)]
+
+
+# =============================================================================
+# Request ID Generation
+# =============================================================================
+
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+# Two-character hex encoding of every byte value, packed as uint16 so a
+# single gather encodes a whole byte
+_HEX_PAIRS = (
+    np.stack(
+        [_HEX_DIGITS[np.arange(256) >> 4], _HEX_DIGITS[np.arange(256) & 0x0F]], axis=1
+    )
+    .copy()
+    .view(np.uint16)
+    .ravel()
+)
+
+# (byte start, byte end, char offset) of each dash-separated UUID group
+_UUID_GROUPS = ((0, 4, 0), (4, 6, 9), (6, 8, 14), (8, 10, 19), (10, 16, 24))
+
+
+def _format_uuid_bytes(raw: np.ndarray) -> np.ndarray:
+    """Encode (n, 16) UUID bytes as (n, 36) ASCII characters."""
+    n = len(raw)
+    hex_bytes = _HEX_PAIRS[raw].view(np.uint8)
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    for byte_start, byte_end, offset in _UUID_GROUPS:
+        chars[:, offset : offset + 2 * (byte_end - byte_start)] = hex_bytes[
+            :, 2 * byte_start : 2 * byte_end
+        ]
+    return chars
+
+
+if njit is not None:  # pragma: no cover - needs numba
+
+    @njit(parallel=True, cache=True)
+    def _format_uuid_bytes_jit(raw, hex_digits):
+        n = raw.shape[0]
+        chars = np.empty((n, 36), dtype=np.uint8)
+        for i in prange(n):
+            pos = 0
+            for j in range(16):
+                if j == 4 or j == 6 or j == 8 or j == 10:
+                    chars[i, pos] = 45  # "-"
+                    pos += 1
+                chars[i, pos] = hex_digits[raw[i, j] >> 4]
+                chars[i, pos + 1] = hex_digits[raw[i, j] & 0x0F]
+                pos += 2
+        return chars
+
+
+def generate_request_ids(n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generate random version 4 UUID strings in bulk.
+
+    The IDs only need to be unique, so they are built from one bulk draw
+    from the numpy RNG instead of calling uuid.uuid4() per request. When
+    numba is installed the hex encoding runs in a compiled kernel; the
+    output is identical either way.
 
-    daily = daily_pattern(hour)
-    weekly = weekly_pattern(day_of_week)
+    Args:
+        n: Number of IDs to generate
+        rng: Random generator
+
+    Returns:
+        Array of UUID strings
+    """
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    # Version 4, RFC 4122 variant
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
 
-    # Add some random noise
-    noise = np.random.normal(1.0, 0.1)
+    if njit is not None:
+        chars = _format_uuid_bytes_jit(raw, _HEX_DIGITS)
+    else:
+        chars = _format_uuid_bytes(raw)
 
-    return max(0.1, daily * weekly * noise)
+    return chars.view("S36").ravel().astype(str)
 
 
 # =============================================================================
@@ -213,16 +375,22 @@ def generate_traffic_multiplier(timestamp: datetime) -> float:
 class AnomalyGenerator:
     """Generate various types of anomalies in traffic data."""
 
-    def __init__(self, anomaly_rate: float = 0.05, seed: int = 42):
+    def __init__(
+        self,
+        anomaly_rate: float = 0.05,
+        seed: int = 42,
+        rng: Optional[np.random.Generator] = None,
+    ):
         """
         Initialize anomaly generator.
 
         Args:
             anomaly_rate: Probability of any time window being anomalous
             seed: Random seed for reproducibility
+            rng: Random generator to draw from (default: a new one from seed)
         """
         self.anomaly_rate = anomaly_rate
-        self.rng = np.random.default_rng(seed)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
         self.anomaly_types = [
             "traffic_spike",
             "traffic_drop",
@@ -230,6 +398,7 @@ class AnomalyGenerator:
             "error_spike",
             "sustained_load",
         ]
+        self.anomaly_weights = [0.25, 0.15, 0.30, 0.20, 0.10]
 
     def should_inject_anomaly(self) -> bool:
         """Determine if an anomaly should be injected."""
@@ -237,8 +406,21 @@ class AnomalyGenerator:
 
     def get_anomaly_type(self) -> str:
         """Get random anomaly type."""
-        weights = [0.25, 0.15, 0.30, 0.20, 0.10]
-        return self.rng.choice(self.anomaly_types, p=weights)
+        return self.rng.choice(self.anomaly_types, p=self.anomaly_weights)
+
+    def sample_anomaly_types(self, n: int) -> np.ndarray:
+        """
+        Decide which of n time windows are anomalous, and how.
+
+        Returns:
+            Array of anomaly types, None for normal windows
+        """
+        is_anomaly = self.rng.random(n) < self.anomaly_rate
+        anomaly_types = np.full(n, None, dtype=object)
+        anomaly_types[is_anomaly] = self.rng.choice(
+            self.anomaly_types, is_anomaly.sum(), p=self.anomaly_weights
+        )
+        return anomaly_types
 
     def apply_traffic_spike(self, base_rpm: float) -> float:
         """Apply traffic spike anomaly."""
@@ -291,6 +473,58 @@ class AnomalyGenerator:
         else:
             return rpm, latency, error_rate, "normal"
 
+    def apply_anomalies(
+        self,
+        anomaly_types: np.ndarray,
+        rpm: np.ndarray,
+        latency: np.ndarray,
+        error_rate: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Apply anomalies to many time windows at once.
+
+        Vectorized form of apply_anomaly(). The metric arrays may have extra
+        trailing dimensions (e.g. one column per endpoint); each element gets
+        its own random factor.
+
+        Args:
+            anomaly_types: Anomaly type per window (None for normal windows)
+            rpm: Request rate per window
+            latency: Latency per window
+            error_rate: Error rate per window
+
+        Returns:
+            Tuple of (modified_rpm, modified_latency, modified_error_rate)
+        """
+        rpm = np.array(rpm, dtype=float)
+        latency = np.array(latency, dtype=float)
+        error_rate = np.array(error_rate, dtype=float)
+
+        mask = anomaly_types == "traffic_spike"
+        rpm[mask] *= self.rng.uniform(3.0, 10.0, rpm[mask].shape)
+
+        mask = anomaly_types == "traffic_drop"
+        rpm[mask] *= self.rng.uniform(0.05, 0.3, rpm[mask].shape)
+
+        mask = anomaly_types == "latency_spike"
+        latency[mask] *= self.rng.uniform(3.0, 20.0, latency[mask].shape)
+
+        mask = anomaly_types == "error_spike"
+        latency[mask] *= 1.5
+        error_rate[mask] = np.minimum(
+            0.8, error_rate[mask] + self.rng.uniform(0.15, 0.5, error_rate[mask].shape)
+        )
+
+        # Multiple metrics affected
+        mask = anomaly_types == "sustained_load"
+        rpm[mask] *= self.rng.uniform(2.0, 4.0, rpm[mask].shape)
+        latency[mask] *= self.rng.uniform(1.5, 3.0, latency[mask].shape)
+        error_rate[mask] = np.minimum(
+            0.5, error_rate[mask] + self.rng.uniform(0.05, 0.15, error_rate[mask].shape)
+        )
+
+        return rpm, latency, error_rate
+
 
 # =============================================================================
 # Data Generation Functions
@@ -302,7 +536,7 @@ def generate_request_logs(
     end_date: datetime,
     base_rps: float = 50,
     anomaly_rate: float = 0.05,
-    seed: int = 42,
+    seed: SeedLike = 42,
 ) -> pd.DataFrame:
     """
     Generate synthetic request log data.
@@ -312,16 +546,13 @@ def generate_request_logs(
         end_date: End of time range
         base_rps: Base requests per second
         anomaly_rate: Rate of anomaly injection
-        seed: Random seed
+        seed: Random seed (or SeedSequence)
 
     Returns:
         DataFrame with request log records
     """
-    np.random.seed(seed)
-    anomaly_gen = AnomalyGenerator(anomaly_rate, seed)
-
-    records = []
-    current_time = start_date
+    rng = np.random.default_rng(seed)
+    anomaly_gen = AnomalyGenerator(anomaly_rate, rng=rng)
 
     # Pre-generate user IDs
     user_ids = [f"user_{i:04d}" for i in range(1000)]
@@ -329,112 +560,133 @@ def generate_request_logs(
     ip_addresses = [f"192.168.{i // 256}.{i % 256}" for i in range(500)]
     ip_addresses.extend([f"10.0.{i // 256}.{i % 256}" for i in range(500)])
 
-    total_duration = (end_date - start_date).total_seconds()
-    generated_seconds = 0
-    last_progress = 0
+    # Endpoint characteristics, one entry per endpoint. Methods and paths
+    # are kept as codes into their distinct values.
+    method_codes, methods = pd.factorize(
+        np.array([e["method"] for e in ENDPOINT_CONFIGS])
+    )
+    path_codes, paths = pd.factorize(np.array([e["path"] for e in ENDPOINT_CONFIGS]))
+    weights = np.array([e["weight"] for e in ENDPOINT_CONFIGS])
+    base_latencies = np.array([e["base_latency_ms"] for e in ENDPOINT_CONFIGS])
+    latency_stds = np.array([e["latency_std"] for e in ENDPOINT_CONFIGS])
+    error_rates = np.array([e["error_rate"] for e in ENDPOINT_CONFIGS])
+    n_endpoints = len(ENDPOINT_CONFIGS)
+
+    # Log-normal latency parameters per endpoint
+    endpoint_mu = np.log(base_latencies)
+    endpoint_sigma = latency_stds / base_latencies
 
     print(f"Generating data from {start_date} to {end_date}")
 
-    while current_time < end_date:
-        # Get traffic multiplier for this timestamp
-        traffic_mult = generate_traffic_multiplier(current_time)
-
-        # Calculate requests for this second
-        effective_rps = base_rps * traffic_mult
-
-        # Check for anomaly injection (per-minute granularity)
-        is_anomaly = False
-        anomaly_type = "normal"
-
-        if current_time.second == 0 and anomaly_gen.should_inject_anomaly():
-            is_anomaly = True
-            anomaly_type = anomaly_gen.get_anomaly_type()
-
-        # Generate requests for each endpoint
-        for endpoint_config in ENDPOINT_CONFIGS:
-            # Calculate endpoint-specific request count
-            endpoint_weight = endpoint_config["weight"]
-            endpoint_rps = effective_rps * endpoint_weight
-
-            # Apply anomaly if applicable
-            current_latency = endpoint_config["base_latency_ms"]
-            current_error_rate = endpoint_config["error_rate"]
-
-            if is_anomaly:
-                endpoint_rps, current_latency, current_error_rate, _ = (
-                    anomaly_gen.apply_anomaly(
-                        anomaly_type,
-                        endpoint_rps,
-                        current_latency,
-                        current_error_rate,
-                    )
-                )
+    # One entry per second of the time range, as int64 epoch microseconds
+    n_seconds = int(np.ceil((end_date - start_date).total_seconds()))
+    second_starts_us = np.datetime64(start_date, "us").astype(np.int64) + (
+        np.arange(n_seconds, dtype=np.int64) * 1_000_000
+    )
+    times = second_starts_us.view("datetime64[us]")
+
+    # Traffic and error rate for every (second, endpoint) cell
+    effective_rps = base_rps * generate_traffic_multiplier_vec(times, rng=rng)
+    endpoint_rps = effective_rps[:, None] * weights
+    error_rate = np.tile(error_rates, (n_seconds, 1))
+
+    # Check for anomaly injection (per-minute granularity); an anomalous
+    # second affects all endpoints, each with its own random factor
+    second_of_minute = times.astype("datetime64[s]").astype(np.int64) % 60
+    minute_starts = np.flatnonzero(second_of_minute == 0)
+    second_anomaly_types = np.full(n_seconds, None, dtype=object)
+    second_anomaly_types[minute_starts] = anomaly_gen.sample_anomaly_types(
+        len(minute_starts)
+    )
 
-            # Poisson distribution for request count
-            request_count = np.random.poisson(endpoint_rps)
+    anomalous = np.flatnonzero(pd.notna(second_anomaly_types))
+    endpoint_rps[anomalous], anomalous_latency, error_rate[anomalous] = (
+        anomaly_gen.apply_anomalies(
+            second_anomaly_types[anomalous],
+            endpoint_rps[anomalous],
+            np.tile(base_latencies, (len(anomalous), 1)),
+            error_rate[anomalous],
+        )
+    )
+    # Latency scale factor per (anomalous second, endpoint)
+    latency_factor = anomalous_latency / base_latencies
+
+    # Poisson distribution for request counts, then one row per request,
+    # ordered by second and endpoint
+    counts = rng.poisson(endpoint_rps)
+    cells = np.repeat(np.arange(counts.size), counts.ravel())
+    second_idx, endpoint_idx = np.divmod(cells, n_endpoints)
+    total = len(cells)
+
+    # Request timestamps with sub-second precision
+    timestamps = np.repeat(second_starts_us, counts.sum(axis=1))
+    timestamps += rng.integers(0, 1_000_000, total, dtype=np.int64)
+    timestamps = timestamps.view("datetime64[us]")
+
+    # Generate latency (log-normal distribution) from the endpoint parameters
+    mu = endpoint_mu[endpoint_idx]
+    sigma = endpoint_sigma[endpoint_idx]
+
+    # Requests in anomalous seconds scale their latency by the anomaly's
+    # factor: mu shifts by log(factor) and sigma shrinks to match
+    anomaly_index = np.full(n_seconds, -1)
+    anomaly_index[anomalous] = np.arange(len(anomalous))
+    rows = np.flatnonzero(anomaly_index[second_idx] >= 0)
+    factor = latency_factor[anomaly_index[second_idx[rows]], endpoint_idx[rows]]
+    mu[rows] += np.log(factor)
+    sigma[rows] /= factor
+
+    # One draw for all requests, clamped to a reasonable range in place
+    latencies = rng.lognormal(mu, sigma)
+    np.clip(latencies, 1, 30000, out=latencies)
+    latencies = latencies.astype(np.int32)
+
+    # Determine status codes
+    is_error = rng.random(total) < error_rate.ravel()[cells]
+    status_codes = np.where(
+        is_error,
+        sample_status_codes(ERROR_STATUS_CODES, ERROR_STATUS_CUM_P, total, rng),
+        sample_status_codes(SUCCESS_STATUS_CODES, SUCCESS_STATUS_CUM_P, total, rng),
+    )
 
-            for _ in range(request_count):
-                # Generate request timestamp with sub-second precision
-                request_time = current_time + timedelta(
-                    microseconds=np.random.randint(0, 1000000)
-                )
+    # Select random attributes, as codes into the pre-generated values
+    # (-1 marks a missing value)
+    user_codes = rng.integers(0, len(user_ids), total, dtype=np.int16)
+    user_codes[rng.random(total) <= 0.2] = -1
+    ip_codes = rng.integers(0, len(ip_addresses), total, dtype=np.int16)
+    user_agent_codes = rng.integers(0, len(USER_AGENTS), total, dtype=np.int8)
+    backend_codes = rng.integers(0, len(BACKENDS), total, dtype=np.int8)
+    error_message_codes = np.where(status_codes >= 400, 0, -1).astype(np.int8)
+    anomaly_codes = pd.Categorical(
+        second_anomaly_types, categories=anomaly_gen.anomaly_types
+    ).codes[second_idx]
+
+    # Repeated strings are stored as categoricals built from their codes
+    df = pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "method": pd.Categorical.from_codes(method_codes[endpoint_idx], methods),
+            "path": pd.Categorical.from_codes(path_codes[endpoint_idx], paths),
+            "status_code": status_codes,
+            "response_time_ms": latencies,
+            "user_id": pd.Categorical.from_codes(user_codes, user_ids),
+            "ip_address": pd.Categorical.from_codes(ip_codes, ip_addresses),
+            "user_agent": pd.Categorical.from_codes(user_agent_codes, USER_AGENTS),
+            "backend_name": pd.Categorical.from_codes(backend_codes, BACKENDS),
+            "request_id": generate_request_ids(total, rng),
+            "error_message": pd.Categorical.from_codes(
+                error_message_codes, ["Error occurred"]
+            ),
+            "anomaly_type": pd.Categorical.from_codes(
+                anomaly_codes, anomaly_gen.anomaly_types
+            ),
+        },
+        copy=False,
+    )
 
-                # Generate latency (log-normal distribution)
-                latency_mean = np.log(current_latency)
-                latency_std = endpoint_config["latency_std"] / current_latency
-                latency = np.random.lognormal(latency_mean, latency_std)
-                latency = max(1, min(30000, latency))  # Clamp to reasonable range
-
-                # Determine status code
-                if np.random.random() < current_error_rate:
-                    # Error response
-                    if np.random.random() < 0.7:
-                        status_code = np.random.choice([400, 401, 403, 404, 422])
-                    else:
-                        status_code = np.random.choice([500, 502, 503, 504])
-                else:
-                    # Success response
-                    status_code = np.random.choice(
-                        [200, 201, 204], p=[0.85, 0.10, 0.05]
-                    )
-
-                # Select random attributes
-                user_id = (
-                    np.random.choice(user_ids) if np.random.random() > 0.2 else None
-                )
-                ip_address = np.random.choice(ip_addresses)
-                user_agent = np.random.choice(USER_AGENTS)
-                backend = np.random.choice(BACKENDS)
-
-                record = {
-                    "timestamp": request_time,
-                    "method": endpoint_config["method"],
-                    "path": endpoint_config["path"],
-                    "status_code": status_code,
-                    "response_time_ms": int(latency),
-                    "user_id": user_id,
-                    "ip_address": ip_address,
-                    "user_agent": user_agent,
-                    "backend_name": backend,
-                    "request_id": str(uuid.uuid4()),
-                    "error_message": None if status_code < 400 else "Error occurred",
-                    "anomaly_type": anomaly_type if is_anomaly else None,
-                }
-                records.append(record)
-
-        # Move to next second
-        current_time += timedelta(seconds=1)
-        generated_seconds += 1
-
-        # Progress indicator
-        progress = int((generated_seconds / total_duration) * 100)
-        if progress > last_progress and progress % 10 == 0:
-            print(f"  Progress: {progress}%")
-            last_progress = progress
-
-    print(f"Generated {len(records):,} request records")
-
-    return pd.DataFrame(records)
+    print(f"Generated {len(df):,} request records")
+
+    return df
 
 
 def generate_aggregated_metrics(
@@ -443,7 +695,7 @@ def generate_aggregated_metrics(
     bucket_minutes: int = 1,
     base_rps: float = 50,
     anomaly_rate: float = 0.05,
-    seed: int = 42,
+    seed: SeedLike = 42,
 ) -> pd.DataFrame:
     """
     Generate synthetic aggregated metrics data.
@@ -457,97 +709,75 @@ def generate_aggregated_metrics(
         bucket_minutes: Aggregation bucket size in minutes
         base_rps: Base requests per second
         anomaly_rate: Rate of anomaly injection
-        seed: Random seed
+        seed: Random seed (or SeedSequence)
 
     Returns:
         DataFrame with aggregated metrics
     """
-    np.random.seed(seed)
-    anomaly_gen = AnomalyGenerator(anomaly_rate, seed)
+    rng = np.random.default_rng(seed)
+    anomaly_gen = AnomalyGenerator(anomaly_rate, rng=rng)
 
-    records = []
-    current_time = start_date
-
-    total_buckets = int((end_date - start_date).total_seconds() / (bucket_minutes * 60))
-    generated_buckets = 0
+    times = pd.date_range(
+        start_date, end_date, freq=f"{bucket_minutes}min", inclusive="left"
+    )
+    total_buckets = len(times)
 
     print(f"Generating {total_buckets:,} aggregated metric buckets")
 
-    while current_time < end_date:
-        # Get traffic multiplier
-        traffic_mult = generate_traffic_multiplier(current_time)
-
-        # Base metrics for this bucket
-        bucket_requests = base_rps * traffic_mult * 60 * bucket_minutes
-        bucket_latency = 80  # Base average latency
-        bucket_error_rate = 0.03  # Base error rate
-
-        # Check for anomaly
-        is_anomaly = anomaly_gen.should_inject_anomaly()
-        anomaly_type = None
-
-        if is_anomaly:
-            anomaly_type = anomaly_gen.get_anomaly_type()
-            bucket_requests, bucket_latency, bucket_error_rate, anomaly_type = (
-                anomaly_gen.apply_anomaly(
-                    anomaly_type,
-                    bucket_requests,
-                    bucket_latency,
-                    bucket_error_rate,
-                )
-            )
-
-        # Add noise
-        bucket_requests = max(
-            1, bucket_requests + np.random.normal(0, bucket_requests * 0.1)
-        )
-        bucket_latency = max(
-            1, bucket_latency + np.random.normal(0, bucket_latency * 0.2)
-        )
-
-        # Calculate derived metrics
-        requests_per_second = bucket_requests / (bucket_minutes * 60)
-
-        # Generate percentiles (approximate)
-        p50 = bucket_latency * 0.7
-        p95 = bucket_latency * 1.8
-        p99 = bucket_latency * 2.5
+    # Base metrics for each bucket
+    bucket_requests = (
+        base_rps
+        * generate_traffic_multiplier_vec(times.to_numpy(), rng=rng)
+        * 60
+        * bucket_minutes
+    )
+    bucket_latency = np.full(total_buckets, 80.0)  # Base average latency
+    bucket_error_rate = np.full(total_buckets, 0.03)  # Base error rate
 
-        # Status distribution
-        total_requests = int(bucket_requests)
-        error_requests = int(bucket_error_rate * total_requests)
-        status_4xx = int(error_requests * 0.7)
-        status_5xx = error_requests - status_4xx
-        status_2xx = total_requests - error_requests
+    # Inject anomalies
+    anomaly_types = anomaly_gen.sample_anomaly_types(total_buckets)
+    bucket_requests, bucket_latency, bucket_error_rate = anomaly_gen.apply_anomalies(
+        anomaly_types, bucket_requests, bucket_latency, bucket_error_rate
+    )
 
-        record = {
-            "time_bucket": current_time,
+    # Add noise
+    bucket_requests = np.maximum(
+        1, bucket_requests + rng.normal(0, bucket_requests * 0.1)
+    )
+    bucket_latency = np.maximum(1, bucket_latency + rng.normal(0, bucket_latency * 0.2))
+
+    # Status distribution
+    total_requests = bucket_requests.astype(np.int64)
+    error_requests = (bucket_error_rate * total_requests).astype(np.int64)
+    status_4xx = (error_requests * 0.7).astype(np.int64)
+    status_5xx = error_requests - status_4xx
+    status_2xx = total_requests - error_requests
+
+    df = pd.DataFrame(
+        {
+            "time_bucket": times,
             "total_requests": total_requests,
-            "requests_per_second": requests_per_second,
+            "requests_per_second": bucket_requests / (bucket_minutes * 60),
             "avg_latency_ms": bucket_latency,
-            "p50_latency_ms": p50,
-            "p95_latency_ms": p95,
-            "p99_latency_ms": p99,
-            "min_latency_ms": max(1, bucket_latency * 0.2),
+            # Generate percentiles (approximate)
+            "p50_latency_ms": bucket_latency * 0.7,
+            "p95_latency_ms": bucket_latency * 1.8,
+            "p99_latency_ms": bucket_latency * 2.5,
+            "min_latency_ms": np.maximum(1, bucket_latency * 0.2),
             "max_latency_ms": bucket_latency * 4,
             "error_rate": bucket_error_rate,
             "status_2xx": status_2xx,
             "status_4xx": status_4xx,
             "status_5xx": status_5xx,
-            "is_anomaly": is_anomaly,
-            "anomaly_type": anomaly_type,
-        }
-        records.append(record)
-
-        current_time += timedelta(minutes=bucket_minutes)
-        generated_buckets += 1
-
-        if generated_buckets % 1000 == 0:
-            print(f"  Generated {generated_buckets:,} / {total_buckets:,} buckets")
-
-    print(f"Generated {len(records):,} aggregated metric records")
+            "is_anomaly": pd.notna(anomaly_types),
+            "anomaly_type": pd.Categorical(
+                anomaly_types, categories=anomaly_gen.anomaly_types
+            ),
+        },
+        copy=False,
+    )
 
-    df = pd.DataFrame(records)
+    print(f"Generated {len(df):,} aggregated metric records")
 
     # Summary
     anomaly_count = df["is_anomaly"].sum()
@@ -558,22 +788,251 @@ def generate_aggregated_metrics(
     return df
 
 
-def insert_to_database(df: pd.DataFrame, table: str = "request_logs") -> int:
+# Target number of rows per streamed shard
+SHARD_ROWS = 1_000_000
+
+
+def iter_shards(
+    generator: Callable[..., pd.DataFrame],
+    start_date: datetime,
+    end_date: datetime,
+    workers: int = 1,
+    step: timedelta = timedelta(seconds=1),
+    shard_steps: Optional[int] = None,
+    seed: int = 42,
+    progress: bool = False,
+    **kwargs: Any,
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate data shard by shard over contiguous time ranges.
+
+    Shards share no state, so each one runs the generator on its own time
+    range with its own child of the seed's SeedSequence (non-overlapping
+    random streams), optionally in parallel worker processes. At most one
+    shard per worker is generated ahead of the consumer, which keeps memory
+    bounded however long the range is.
+
+    Args:
+        generator: generate_request_logs or generate_aggregated_metrics
+        start_date: Start of time range
+        end_date: End of time range
+        workers: Number of worker processes (1 = generate in-process)
+        step: Generator time step; shard boundaries fall on multiples of it
+        shard_steps: Maximum steps per shard (default: one shard per worker)
+        seed: Base random seed
+        progress: Report progress once per shard (see shard_progress())
+        **kwargs: Further arguments for the generator
+
+    Yields:
+        DataFrame per shard, in time order
+    """
+    # Split the range into whole steps, as evenly as possible
+    total_steps = int(np.ceil((end_date - start_date) / step))
+    n_shards = max(1, workers)
+    if shard_steps:
+        n_shards = max(n_shards, int(np.ceil(total_steps / shard_steps)))
+
+    edges = np.linspace(0, total_steps, n_shards + 1).round().astype(int)
+    bounds = [start_date + int(edge) * step for edge in edges[:-1]] + [end_date]
+    child_seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    shards = [
+        (bounds[i], bounds[i + 1], child_seeds[i])
+        for i in range(n_shards)
+        if bounds[i] < bounds[i + 1]
+    ]
+
+    if workers > 1:
+        print(f"Generating {len(shards)} shards in {workers} worker processes")
+
+    frames = _generate_shards(generator, shards, workers, kwargs)
+    if not progress:
+        yield from frames
+        return
+
+    with shard_progress(len(shards)) as report:
+        for df in frames:
+            report(df)
+            yield df
+
+
+def _generate_shards(
+    generator: Callable[..., pd.DataFrame],
+    shards: list[tuple[datetime, datetime, np.random.SeedSequence]],
+    workers: int,
+    kwargs: dict[str, Any],
+) -> Iterator[pd.DataFrame]:
+    """Run the generator for each (start, end, seed) shard, in order."""
+    if workers <= 1:
+        for shard_start, shard_end, shard_seed in shards:
+            yield generator(shard_start, shard_end, seed=shard_seed, **kwargs)
+        return
+
+    # Start workers fresh rather than forking: forking after numba's parallel
+    # kernels have started their thread pool deadlocks the children
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        pending = deque()
+        for shard_start, shard_end, shard_seed in shards:
+            pending.append(
+                executor.submit(
+                    generator, shard_start, shard_end, seed=shard_seed, **kwargs
+                )
+            )
+            if len(pending) > workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+@contextmanager
+def shard_progress(total: int) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """
+    Report progress once per generated shard.
+
+    Shows a tqdm progress bar when tqdm is installed, and otherwise prints
+    one line per shard.
+
+    Args:
+        total: Number of shards
+
+    Yields:
+        Function to call with each shard as it is generated
+    """
+    try:
+        from tqdm.auto import tqdm
+    except ImportError:
+        tqdm = None
+
+    if tqdm is None:
+        done = 0
+
+        def print_progress(df: pd.DataFrame) -> None:
+            nonlocal done
+            done += 1
+            print(f"  Progress: {done}/{total} shards ({len(df):,} records)")
+
+        yield print_progress
+        return
+
+    with tqdm(total=total, unit="shard") as bar:
+
+        def update_bar(df: pd.DataFrame) -> None:
+            bar.update(1)
+            bar.set_postfix(records=len(df))
+
+        yield update_bar
+
+
+def generate_sharded(
+    generator: Callable[..., pd.DataFrame],
+    start_date: datetime,
+    end_date: datetime,
+    workers: int = 1,
+    step: timedelta = timedelta(seconds=1),
+    seed: int = 42,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Generate data for contiguous time shards in parallel worker processes.
+
+    See iter_shards() for the arguments.
+
+    Returns:
+        DataFrame with the shards concatenated in time order
+    """
+    shards = iter_shards(
+        generator, start_date, end_date, workers=workers, step=step, seed=seed, **kwargs
+    )
+    return pd.concat(shards, ignore_index=True)
+
+
+@contextmanager
+def shard_writer(
+    output_path: Path, format_type: str
+) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """
+    Open an output file that generated shards are appended to one by one.
+
+    Parquet shards become row groups; CSV and JSON files are byte-for-byte
+    what to_csv / to_json write for the concatenated DataFrame.
+
+    Args:
+        output_path: Output file path
+        format_type: Output format (csv, json, parquet)
+
+    Yields:
+        Function appending one shard to the file
+    """
+    if format_type == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+
+        def write_parquet(shard: pd.DataFrame) -> None:
+            nonlocal writer
+            if writer is None:
+                table = pa.Table.from_pandas(shard, preserve_index=False)
+                writer = pq.ParquetWriter(output_path, table.schema, compression="zstd")
+            else:
+                table = pa.Table.from_pandas(
+                    shard, schema=writer.schema, preserve_index=False
+                )
+            writer.write_table(table)
+
+        try:
+            yield write_parquet
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    with open(output_path, "w", newline="") as f:
+        has_rows = False
+
+        def write_text(shard: pd.DataFrame) -> None:
+            nonlocal has_rows
+            if format_type == "csv":
+                shard.to_csv(f, index=False, header=not has_rows)
+            elif len(shard):
+                # Splice the shard's records into one top-level JSON array;
+                # to_json writes "[\n" + records joined by ",\n" + "\n]"
+                records = shard.to_json(orient="records", date_format="iso", indent=2)
+                if has_rows:
+                    f.write(",\n")
+                f.write(records[2:-2])
+            has_rows = has_rows or len(shard) > 0
+
+        if format_type == "json":
+            f.write("[\n")
+        yield write_text
+        if format_type == "json":
+            f.write("\n]")
+
+
+def insert_to_database(
+    df: pd.DataFrame, table: str = "request_logs", batch_size: int = 100_000
+) -> int:
     """
     Insert generated data into PostgreSQL database.
 
+    Rows are streamed with COPY in batches of batch_size, so only one
+    batch is held as CSV text at a time. All batches share one transaction.
+
     Args:
         df: DataFrame with request log data
         table: Target table name
+        batch_size: Rows serialized per COPY batch
 
     Returns:
         Number of records inserted
     """
     import psycopg2
-    from psycopg2.extras import execute_values
 
     conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+    conn.autocommit = False
 
     # Prepare data for insertion
     columns = [
@@ -590,36 +1049,31 @@ def insert_to_database(df: pd.DataFrame, table: str = "request_logs") -> int:
         "error_message",
     ]
 
-    # Remove anomaly metadata columns if present
-    insert_df = df[columns].copy()
-
-    # Convert to list of tuples
-    values = [tuple(row) for row in insert_df.itertuples(index=False)]
-
-    # Batch insert
-    batch_size = 5000
-    total_inserted = 0
-
-    print(f"Inserting {len(values):,} records into {table}...")
-
-    for i in range(0, len(values), batch_size):
-        batch = values[i : i + batch_size]
-
-        query = f"""
-            INSERT INTO {table} ({", ".join(columns)})
-            VALUES %s
-        """
+    query = f"""
+        COPY {table} ({", ".join(columns)})
+        FROM STDIN WITH (FORMAT csv, NULL '\\N')
+    """
 
-        execute_values(cursor, query, batch)
+    print(f"Inserting {len(df):,} records into {table}...")
+
+    try:
+        with conn.cursor() as cursor:
+            buffer = io.StringIO()
+            for start in range(0, len(df), batch_size):
+                buffer.seek(0)
+                buffer.truncate()
+                # Select columns per batch, so only one batch is copied at a
+                # time; anomaly metadata columns are left out
+                df.iloc[start : start + batch_size][columns].to_csv(
+                    buffer, index=False, header=False, na_rep="\\N"
+                )
+                buffer.seek(0)
+                cursor.copy_expert(query, buffer)
         conn.commit()
+    finally:
+        conn.close()
 
-        total_inserted += len(batch)
-        print(f"  Inserted {total_inserted:,} / {len(values):,} records")
-
-    cursor.close()
-    conn.close()
-
-    return total_inserted
+    return len(df)
 
 
 # =============================================================================
@@ -627,6 +1081,14 @@ def insert_to_database(df: pd.DataFrame, table: str = "request_logs") -> int:
 # =============================================================================
 
 
+def positive_float(value: str) -> float:
+    """Parse a command-line value that must be a number greater than zero."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate synthetic API traffic data for ML training",
@@ -647,6 +1109,9 @@ Examples:
 
     # Generate high-traffic scenario
     python generate_synthetic_data.py --days 7 --base-rps 200 --output high_traffic.csv
+
+    # Generate 30 days using 4 worker processes
+    python generate_synthetic_data.py --days 30 --workers 4 --output logs.csv
         """,
     )
 
@@ -674,7 +1139,7 @@ Examples:
 
     parser.add_argument(
         "--base-rps",
-        type=float,
+        type=positive_float,
         default=50,
         help="Base requests per second (default: 50)",
     )
@@ -693,6 +1158,13 @@ Examples:
         help="Random seed for reproducibility (default: 42)",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes generating time shards in parallel (default: 1)",
+    )
+
     parser.add_argument(
         "--output",
         "-o",
@@ -727,64 +1199,94 @@ Examples:
     print(f"Anomaly rate: {args.anomaly_rate}")
     print()
 
-    # Generate data
+    # Generate data shard by shard, so any number of days fits in memory
     if args.type == "requests":
-        df = generate_request_logs(
+        shards = iter_shards(
+            generate_request_logs,
             start_date,
             end_date,
+            workers=args.workers,
+            shard_steps=int(np.ceil(SHARD_ROWS / args.base_rps)),
+            seed=args.seed,
+            progress=True,
             base_rps=args.base_rps,
             anomaly_rate=args.anomaly_rate,
-            seed=args.seed,
         )
     else:
-        df = generate_aggregated_metrics(
+        shards = iter_shards(
+            generate_aggregated_metrics,
             start_date,
             end_date,
+            workers=args.workers,
+            step=timedelta(minutes=args.bucket),
+            shard_steps=SHARD_ROWS,
+            seed=args.seed,
+            progress=True,
             bucket_minutes=args.bucket,
             base_rps=args.base_rps,
             anomaly_rate=args.anomaly_rate,
-            seed=args.seed,
         )
 
-    # Insert to database if requested
-    if args.insert_db:
-        if args.type != "requests":
-            print("Warning: Only request logs can be inserted into database")
-        else:
-            try:
-                inserted = insert_to_database(df)
-                print(f"Successfully inserted {inserted:,} records into database")
-            except Exception as e:
-                print(f"Database insertion failed: {e}")
-                sys.exit(1)
-
-    # Save to file if output specified
+    if args.insert_db and args.type != "requests":
+        print("Warning: Only request logs can be inserted into database")
+
+    output_path = None
     if args.output:
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if args.format == "csv":
-            df.to_csv(output_path, index=False)
-        elif args.format == "json":
-            df.to_json(output_path, orient="records", date_format="iso", indent=2)
-        elif args.format == "parquet":
-            df.to_parquet(output_path, index=False)
+    total_records = 0
+    inserted = 0
+    time_range = []
+    anomaly_counts = pd.Series(dtype="int64")
+
+    with ExitStack() as stack:
+        write = None
+        if output_path:
+            write = stack.enter_context(shard_writer(output_path, args.format))
+
+        for df in shards:
+            # Insert to database if requested
+            if args.insert_db and args.type == "requests":
+                try:
+                    inserted += insert_to_database(df)
+                except Exception as e:
+                    print(f"Database insertion failed: {e}")
+                    sys.exit(1)
+
+            # Save to file if output specified
+            if write:
+                write(df)
+
+            total_records += len(df)
+            if len(df):
+                time_col = df[
+                    "timestamp" if "timestamp" in df.columns else "time_bucket"
+                ]
+                time_range.extend([time_col.min(), time_col.max()])
+            if "anomaly_type" in df.columns:
+                anomaly_counts = anomaly_counts.add(
+                    df["anomaly_type"].value_counts(), fill_value=0
+                )
+
+    if args.insert_db and args.type == "requests":
+        print(f"Successfully inserted {inserted:,} records into database")
 
-        print(f"Saved {len(df):,} records to {output_path}")
+    if output_path:
+        print(f"Saved {total_records:,} records to {output_path}")
 
     # Print summary
     print("\nData Summary:")
-    print(f"  Total records: {len(df):,}")
-    print(
-        f"  Time range: {df['timestamp' if 'timestamp' in df.columns else 'time_bucket'].min()} to {df['timestamp' if 'timestamp' in df.columns else 'time_bucket'].max()}"
-    )
+    print(f"  Total records: {total_records:,}")
+    if time_range:
+        print(f"  Time range: {min(time_range)} to {max(time_range)}")
 
-    if "anomaly_type" in df.columns:
-        anomaly_counts = df["anomaly_type"].value_counts(dropna=False)
+    if total_records:
+        anomaly_counts = anomaly_counts[anomaly_counts > 0].astype("int64")
+        anomaly_counts["normal"] = total_records - anomaly_counts.sum()
         print(f"  Anomaly distribution:")
-        for anomaly_type, count in anomaly_counts.items():
-            label = anomaly_type if anomaly_type else "normal"
-            print(f"    {label}: {count:,} ({count / len(df) * 100:.1f}%)")
+        for label, count in anomaly_counts.sort_values(ascending=False).items():
+            print(f"    {label}: {count:,} ({count / total_records * 100:.1f}%)")
 
 
 if __name__ == "__main__":
@@ -4,13 +4,29 @@ AEGIS ML - Pytest Fixtures
 Shared fixtures for unit tests.
 """
 
+import hashlib
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# Fixed string hashing for interpreters started from this run (e.g.
+# pytest-xdist workers), so set iteration order is the same on every worker.
+# It cannot change hashing in the already running interpreter.
+os.environ.setdefault("PYTHONHASHSEED", "0")
+
+# When numba is installed, keep compiled kernels (all @njit(cache=True))
+# under the pytest cache so later runs skip compilation even if the source
+# tree is read-only. Must be set before numba is first imported.
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR", str(Path(__file__).parent.parent / ".pytest_cache" / "numba")
+)
+
+import joblib
 import numpy as np
 import pandas as pd
 import pytest
+import sklearn
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -20,43 +36,54 @@ from models.anomaly_detector import (
     RealTimeAnomalyDetector,
     TrafficMetrics,
 )
+from models import rate_limit_optimizer
 from models.rate_limit_optimizer import RateLimitOptimizer
 
+# Fixtures that fit a model; tests depending on them are marked slow
+TRAINING_FIXTURES = {"trained_detector"}
 
-@pytest.fixture
-def seed():
-    """Set random seed for reproducibility."""
-    np.random.seed(42)
-    return 42
+# Reference time for generated data, read once per session
+NOW = datetime.utcnow()
 
 
-@pytest.fixture
-def sample_training_data(seed):
-    """Generate sample training data for anomaly detection."""
-    n_samples = 1000
+def pytest_collection_modifyitems(items):
+    """Mark tests that need a trained model as slow."""
+    for item in items:
+        if TRAINING_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.slow)
 
-    # Generate normal traffic patterns
-    data = pd.DataFrame(
-        {
-            "requests_per_second": np.random.normal(50, 10, n_samples),
-            "avg_latency_ms": np.random.lognormal(3.5, 0.5, n_samples),
-            "p95_latency_ms": np.random.lognormal(4.0, 0.5, n_samples),
-            "p99_latency_ms": np.random.lognormal(4.5, 0.5, n_samples),
-            "error_rate": np.abs(np.random.normal(0.02, 0.01, n_samples)),
-        }
-    )
 
-    # Clip to reasonable ranges
-    data["requests_per_second"] = data["requests_per_second"].clip(1, 200)
-    data["error_rate"] = data["error_rate"].clip(0, 1)
+@pytest.fixture(scope="session")
+def sample_training_data():
+    """Generate sample training data for anomaly detection (shared, read-only)."""
+    # Local generator, so a session-scoped fixture never touches global state
+    rng = np.random.default_rng(42)
+    # Enough for a stable baseline; the forest subsamples 256 rows per tree
+    n_samples = 400
 
-    return data
+    # Fill one contiguous float32 buffer column by column; the detector
+    # only needs the numeric feature matrix
+    arr = np.empty((n_samples, len(AnomalyDetector.FEATURE_NAMES)), dtype=np.float32)
+    arr[:, 0] = rng.normal(50, 10, n_samples)
+    arr[:, 1] = rng.lognormal(3.5, 0.5, n_samples)
+    arr[:, 2] = rng.lognormal(4.0, 0.5, n_samples)
+    arr[:, 3] = rng.lognormal(4.5, 0.5, n_samples)
+    arr[:, 4] = rng.normal(0.02, 0.01, n_samples)
 
+    # Clip to reasonable ranges, in place
+    rps, error_rate = arr[:, 0], arr[:, 4]
+    np.clip(rps, 1, 200, out=rps)
+    np.abs(error_rate, out=error_rate)
+    np.clip(error_rate, 0, 1, out=error_rate)
 
-@pytest.fixture
+    return pd.DataFrame(arr, columns=AnomalyDetector.FEATURE_NAMES, copy=False)
+
+
+@pytest.fixture(scope="session")
 def trained_detector(sample_training_data):
-    """Create a trained anomaly detector."""
-    detector = AnomalyDetector(contamination=0.1)
+    """Create a trained anomaly detector (trained once, shared read-only)."""
+    # A small forest is enough for the fixed test cases and fits 5x faster
+    detector = AnomalyDetector(contamination=0.1, n_estimators=20)
     detector.train(sample_training_data)
     return detector
 
@@ -64,15 +91,15 @@ def trained_detector(sample_training_data):
 @pytest.fixture
 def realtime_detector(trained_detector):
     """Create a realtime anomaly detector with trained base model."""
+    # Only the window state is per test; the trained base model is shared
     return RealTimeAnomalyDetector(
         trained_detector, window_size=10, persistence_threshold=3
     )
 
 
-@pytest.fixture
-def sample_endpoint_data(seed):
+def make_endpoint_data(n_samples: int = 500) -> pd.DataFrame:
     """Generate sample endpoint data for rate limit optimization."""
-    n_samples = 5000
+    rng = np.random.default_rng(42)
     endpoints = [
         "/api/users",
         "/api/orders",
@@ -82,51 +109,120 @@ def sample_endpoint_data(seed):
     ]
     methods = ["GET", "POST", "PUT", "DELETE"]
 
-    timestamps = pd.date_range(
-        end=datetime.utcnow(),
-        periods=n_samples,
-        freq="1s",
+    # One row per second ending at the start of the current hour; same values
+    # as pd.date_range(end=..., periods=n_samples, freq="1s"). The optimizer
+    # buckets by minute and hour, so a fixed alignment keeps the profiles
+    # (and the trained_optimizer cache) the same from run to run
+    end = np.datetime64(NOW, "h").astype("datetime64[s]")
+    timestamps = end - np.arange(n_samples - 1, -1, -1).astype("timedelta64[s]")
+    idx = np.arange(n_samples)
+
+    # Both ID columns repeat with the row index, so format each distinct
+    # value once and gather
+    user_ids = np.char.add("user_", np.char.zfill(np.arange(100).astype(str), 4))
+    octets = np.arange(256)
+    ip_addresses = np.char.add(
+        np.char.add("192.168.", octets.astype(str)),
+        np.char.add(".", (octets * 7 % 256).astype(str)),
     )
 
-    data = pd.DataFrame(
+    # Draw every column as a numpy array first (in the original draw order)
+    endpoint_arr = rng.choice(endpoints, n_samples, p=[0.3, 0.25, 0.25, 0.15, 0.05])
+    method_arr = rng.choice(methods, n_samples, p=[0.6, 0.25, 0.1, 0.05])
+    rt_arr = rng.lognormal(3.5, 0.5, n_samples)
+    sc_arr = rng.choice(
+        np.array([200, 201, 400, 404, 500]),
+        n_samples,
+        p=[0.85, 0.05, 0.05, 0.03, 0.02],
+    )
+    uid_arr = np.where(rng.random(n_samples) > 0.2, user_ids[idx % 100], None)
+    # ip_address only feeds unique-count fallbacks, so store it as codes
+    # into the 256 distinct addresses, as the synthetic data generator does
+    ip_arr = pd.Categorical.from_codes(idx % 256, ip_addresses)
+
+    return pd.DataFrame(
         {
             "timestamp": timestamps,
-            "endpoint": np.random.choice(
-                endpoints, n_samples, p=[0.3, 0.25, 0.25, 0.15, 0.05]
-            ),
-            "method": np.random.choice(methods, n_samples, p=[0.6, 0.25, 0.1, 0.05]),
-            "response_time_ms": np.random.lognormal(3.5, 0.5, n_samples),
-            "status_code": np.random.choice(
-                [200, 201, 400, 404, 500],
-                n_samples,
-                p=[0.85, 0.05, 0.05, 0.03, 0.02],
-            ),
-            "user_id": [
-                f"user_{i % 100:04d}" if np.random.random() > 0.2 else None
-                for i in range(n_samples)
-            ],
-            "ip_address": [
-                f"192.168.{i % 256}.{(i * 7) % 256}" for i in range(n_samples)
-            ],
-        }
+            "endpoint": endpoint_arr,
+            "method": method_arr,
+            "response_time_ms": rt_arr,
+            "status_code": sc_arr,
+            "user_id": uid_arr,
+            "ip_address": ip_arr,
+        },
+        copy=False,
     )
 
-    return data
+
+@pytest.fixture(scope="session")
+def sample_endpoint_data(request):
+    """
+    Sample endpoint data (shared, read-only).
+
+    500 rows by default; tests can request another size through indirect
+    parametrization.
+    """
+    return make_endpoint_data(getattr(request, "param", 500))
+
+
+def _endpoint_data_digest(data: pd.DataFrame) -> bytes:
+    """
+    Hash the contents of an endpoint data frame.
+
+    Timestamps are hashed as offsets from the hour the first row falls in,
+    since the data ends near the current time and would otherwise never match
+    a previous run. The offsets keep the minute and hour alignment that the
+    optimizer's resampling depends on.
+    """
+    origin = data["timestamp"].iloc[0].floor("h")
+    relative = data.assign(timestamp=data["timestamp"] - origin)
+    return pd.util.hash_pandas_object(relative).to_numpy().tobytes()
 
 
 @pytest.fixture
-def trained_optimizer(sample_endpoint_data):
-    """Create a trained rate limit optimizer."""
+def mutable_endpoint_data(sample_endpoint_data):
+    """Copy of the sample endpoint data for tests that modify it."""
+    return sample_endpoint_data.copy()
+
+
+@pytest.fixture(scope="module")
+def trained_optimizer(request, sample_endpoint_data):
+    """
+    Create a trained rate limit optimizer.
+
+    The trained state is saved under .pytest_cache and reused by later runs.
+    The cache key covers the optimizer module, the versions of the libraries
+    that pickle and compute its state, and the contents of the sample data it
+    is trained on (including its size), so changing any of them retrains;
+    `pytest --cache-clear` forces it.
+    """
+    cache = getattr(request.config, "cache", None)
+    cache_dir = None
+    if cache is not None:
+        versions = " ".join(
+            (sklearn.__version__, joblib.__version__, np.__version__, pd.__version__)
+        )
+        key = hashlib.sha256(
+            Path(rate_limit_optimizer.__file__).read_bytes()
+            + versions.encode()
+            + _endpoint_data_digest(sample_endpoint_data)
+        ).hexdigest()[:16]
+        cache_dir = cache.mkdir(f"aegis-optimizer-{key}")
+        if (cache_dir / "optimizer_state.joblib").exists():
+            return RateLimitOptimizer.load(cache_dir)
+
     optimizer = RateLimitOptimizer()
     optimizer.analyze_traffic(sample_endpoint_data)
+    if cache_dir is not None:
+        optimizer.save(cache_dir)
     return optimizer
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def normal_metrics():
     """Create normal traffic metrics."""
     return TrafficMetrics(
-        timestamp=datetime.utcnow(),
+        timestamp=NOW,
         requests_per_second=50.0,
         avg_latency_ms=30.0,
         p95_latency_ms=60.0,
@@ -135,11 +231,11 @@ def normal_metrics():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def anomalous_metrics():
     """Create anomalous traffic metrics (traffic spike)."""
     return TrafficMetrics(
-        timestamp=datetime.utcnow(),
+        timestamp=NOW,
         requests_per_second=500.0,
         avg_latency_ms=200.0,
         p95_latency_ms=500.0,
@@ -4,11 +4,13 @@ AEGIS ML - Anomaly Detector Tests
 Unit tests for the anomaly detection module.
 """
 
+import dataclasses
+import io
 import shutil
 import sys
-import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
@@ -25,6 +27,61 @@ from models.anomaly_detector import (
     TrafficMetrics,
 )
 
+# Tests never depend on the wall clock, so all metrics share one timestamp
+FIXED_TS = datetime(2024, 1, 1, 12, 0, 0)
+
+
+# Shared metric inputs; read-only so no test can alter them for another
+NORMAL = MappingProxyType(
+    {
+        "requests_per_second": 50.0,
+        "avg_latency_ms": 30.0,
+        "p95_latency_ms": 60.0,
+        "p99_latency_ms": 90.0,
+        "error_rate": 0.02,
+    }
+)
+# The forest scores a value past the edge of the training data like the edge
+# itself, so a spike in one feature alone can score as normal traffic. The
+# traffic and error spikes also blow up tail latency, as they do under real
+# load; p99 latency does not feed anomaly typing, so the expected types hold.
+SPIKE_RPS = MappingProxyType(
+    {**NORMAL, "requests_per_second": 500.0, "p99_latency_ms": 1000.0}
+)
+SPIKE_LAT = MappingProxyType(
+    {
+        **NORMAL,
+        "avg_latency_ms": 500.0,
+        "p95_latency_ms": 1000.0,
+        "p99_latency_ms": 2000.0,
+    }
+)
+SPIKE_ERR = MappingProxyType({**NORMAL, "error_rate": 0.5, "p99_latency_ms": 1000.0})
+
+
+def _metrics(**overrides) -> TrafficMetrics:
+    """Build normal traffic metrics with selected fields overridden."""
+    return TrafficMetrics(timestamp=FIXED_TS, **{**NORMAL, **overrides})
+
+
+# case name -> (metrics, expected is_anomaly, expected anomaly type)
+DETECTION_CASES = {
+    "normal_traffic": (_metrics(), False, None),
+    "traffic_spike": (_metrics(**SPIKE_RPS), True, AnomalyType.TRAFFIC_SPIKE),
+    "latency_spike": (_metrics(**SPIKE_LAT), True, AnomalyType.LATENCY_SPIKE),
+    "error_spike": (_metrics(**SPIKE_ERR), True, AnomalyType.ERROR_RATE_SPIKE),
+    "dict_input": (NORMAL, False, None),
+}
+
+
+@pytest.fixture(scope="module")
+def detection_results(trained_detector):
+    """Score every detection case with a single detect_batch call."""
+    results = trained_detector.detect_batch(
+        [metrics for metrics, _, _ in DETECTION_CASES.values()]
+    )
+    return dict(zip(DETECTION_CASES, results))
+
 
 class TestTrafficMetrics:
     """Tests for TrafficMetrics dataclass."""
@@ -68,7 +125,7 @@ class TestTrafficMetrics:
     def test_to_feature_array(self):
         """Test converting metrics to feature array."""
         metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
+            timestamp=FIXED_TS,
             requests_per_second=100.0,
             avg_latency_ms=50.0,
             p95_latency_ms=100.0,
@@ -78,45 +135,28 @@ class TestTrafficMetrics:
         features = metrics.to_feature_array()
 
         assert len(features) == 5
-        assert features[0] == 100.0
-        assert features[1] == 50.0
-        assert features[2] == 100.0
-        assert features[3] == 150.0
-        assert features[4] == 0.01
+        assert features.dtype == np.float32
+        assert features[0] == pytest.approx(100.0)
+        assert features[1] == pytest.approx(50.0)
+        assert features[2] == pytest.approx(100.0)
+        assert features[3] == pytest.approx(150.0)
+        assert features[4] == pytest.approx(0.01)
 
+    def test_immutable(self, normal_metrics):
+        """Test that metrics cannot be modified after creation."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            normal_metrics.requests_per_second = 1.0
 
-class TestAnomalyDetector:
-    """Tests for AnomalyDetector class."""
-
-    @pytest.fixture
-    def sample_training_data(self):
-        """Generate sample training data."""
-        np.random.seed(42)
-        n_samples = 1000
-
-        # Generate normal traffic patterns
-        data = pd.DataFrame(
-            {
-                "requests_per_second": np.random.normal(50, 10, n_samples),
-                "avg_latency_ms": np.random.lognormal(3.5, 0.5, n_samples),
-                "p95_latency_ms": np.random.lognormal(4.0, 0.5, n_samples),
-                "p99_latency_ms": np.random.lognormal(4.5, 0.5, n_samples),
-                "error_rate": np.abs(np.random.normal(0.02, 0.01, n_samples)),
-            }
-        )
+        assert not hasattr(normal_metrics, "__dict__")
 
-        # Clip to reasonable ranges
-        data["requests_per_second"] = data["requests_per_second"].clip(1, 200)
-        data["error_rate"] = data["error_rate"].clip(0, 1)
 
-        return data
+class TestAnomalyDetector:
+    """Tests for AnomalyDetector class."""
 
-    @pytest.fixture
-    def trained_detector(self, sample_training_data):
-        """Create a trained detector."""
-        detector = AnomalyDetector(contamination=0.1)
-        detector.train(sample_training_data)
-        return detector
+    @pytest.fixture(scope="class")
+    def untrained_detector(self):
+        """Create a default detector that is never trained (shared, read-only)."""
+        return AnomalyDetector()
 
     def test_initialization(self):
         """Test detector initialization."""
@@ -131,6 +171,7 @@ class TestAnomalyDetector:
         assert detector.threshold_multiplier == 2.5
         assert not detector.is_trained
 
+    @pytest.mark.slow
     def test_train(self, sample_training_data):
         """Test model training."""
         detector = AnomalyDetector(contamination=0.1)
@@ -144,26 +185,27 @@ class TestAnomalyDetector:
         assert "baselines" in summary
         assert len(detector.baselines) == 5  # 5 features
 
+    @pytest.mark.slow
     def test_train_with_list_input(self):
         """Test training with list of TrafficMetrics."""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
+        n_samples = 100
         metrics_list = [
-            TrafficMetrics(
-                timestamp=datetime.utcnow(),
-                requests_per_second=np.random.normal(50, 10),
-                avg_latency_ms=np.random.lognormal(3.5, 0.5),
-                p95_latency_ms=np.random.lognormal(4.0, 0.5),
-                p99_latency_ms=np.random.lognormal(4.5, 0.5),
-                error_rate=abs(np.random.normal(0.02, 0.01)),
+            TrafficMetrics(FIXED_TS, rps, avg, p95, p99, err)
+            for rps, avg, p95, p99, err in zip(
+                rng.normal(50, 10, n_samples),
+                rng.lognormal(3.5, 0.5, n_samples),
+                rng.lognormal(4.0, 0.5, n_samples),
+                rng.lognormal(4.5, 0.5, n_samples),
+                np.abs(rng.normal(0.02, 0.01, n_samples)),
             )
-            for _ in range(100)
         ]
 
         detector = AnomalyDetector(contamination=0.1)
         summary = detector.train(metrics_list)
 
         assert detector.is_trained
-        assert summary["samples"] == 100
+        assert summary["samples"] == n_samples
 
     def test_train_insufficient_data(self):
         """Test that training fails with insufficient data."""
@@ -181,106 +223,31 @@ class TestAnomalyDetector:
         with pytest.raises(ValueError, match="Insufficient training data"):
             detector.train(data)
 
-    def test_detect_normal_traffic(self, trained_detector):
-        """Test detection of normal traffic."""
-        metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
-            requests_per_second=50.0,
-            avg_latency_ms=30.0,
-            p95_latency_ms=60.0,
-            p99_latency_ms=90.0,
-            error_rate=0.02,
-        )
-
-        result = trained_detector.detect(metrics)
+    @pytest.mark.parametrize("case", list(DETECTION_CASES))
+    def test_detect(self, detection_results, case):
+        """Test detection of normal and anomalous traffic."""
+        _, expected_is_anomaly, expected_type = DETECTION_CASES[case]
+        result = detection_results[case]
 
         assert isinstance(result, AnomalyResult)
-        assert not result.is_anomaly
+        assert result.is_anomaly == expected_is_anomaly
         assert 0 <= result.normalized_score <= 1
         assert result.explanation != ""
+        if expected_is_anomaly:
+            assert result.anomaly_type == expected_type
+            assert result.severity is not None
 
-    def test_detect_traffic_spike(self, trained_detector):
-        """Test detection of traffic spike."""
-        metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
-            requests_per_second=500.0,  # Much higher than normal
-            avg_latency_ms=30.0,
-            p95_latency_ms=60.0,
-            p99_latency_ms=90.0,
-            error_rate=0.02,
-        )
-
-        result = trained_detector.detect(metrics)
-
-        assert result.is_anomaly
-        assert result.anomaly_type == AnomalyType.TRAFFIC_SPIKE
-        assert result.severity is not None
-
-    def test_detect_latency_spike(self, trained_detector):
-        """Test detection of latency spike."""
-        metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
-            requests_per_second=50.0,
-            avg_latency_ms=500.0,  # Much higher than normal
-            p95_latency_ms=1000.0,
-            p99_latency_ms=2000.0,
-            error_rate=0.02,
-        )
-
-        result = trained_detector.detect(metrics)
-
-        assert result.is_anomaly
-        assert result.anomaly_type == AnomalyType.LATENCY_SPIKE
-
-    def test_detect_error_spike(self, trained_detector):
-        """Test detection of error rate spike."""
-        metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
-            requests_per_second=50.0,
-            avg_latency_ms=30.0,
-            p95_latency_ms=60.0,
-            p99_latency_ms=90.0,
-            error_rate=0.5,  # 50% error rate
-        )
+    def test_detect_matches_batch(self, trained_detector, detection_results):
+        """Test that single-point detection agrees with batch detection."""
+        metrics = DETECTION_CASES["normal_traffic"][0]
 
         result = trained_detector.detect(metrics)
 
-        assert result.is_anomaly
-        assert result.anomaly_type == AnomalyType.ERROR_RATE_SPIKE
-
-    def test_detect_with_dict_input(self, trained_detector):
-        """Test detection with dictionary input."""
-        metrics_dict = {
-            "requests_per_second": 50.0,
-            "avg_latency_ms": 30.0,
-            "p95_latency_ms": 60.0,
-            "p99_latency_ms": 90.0,
-            "error_rate": 0.02,
-        }
-
-        result = trained_detector.detect(metrics_dict)
-
-        assert isinstance(result, AnomalyResult)
-        assert not result.is_anomaly
+        assert result == detection_results["normal_traffic"]
 
     def test_detect_batch(self, trained_detector):
         """Test batch detection."""
-        metrics_list = [
-            {
-                "requests_per_second": 50.0,
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            },
-            {
-                "requests_per_second": 500.0,  # Anomaly
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            },
-        ]
+        metrics_list = [NORMAL, SPIKE_RPS]
 
         results = trained_detector.detect_batch(metrics_list)
 
@@ -288,51 +255,66 @@ class TestAnomalyDetector:
         assert not results[0].is_anomaly
         assert results[1].is_anomaly
 
-    def test_detect_untrained_model(self):
-        """Test that detection fails on untrained model."""
-        detector = AnomalyDetector()
-        metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
-            requests_per_second=50.0,
-            avg_latency_ms=30.0,
-            p95_latency_ms=60.0,
-            p99_latency_ms=90.0,
-            error_rate=0.02,
+    def test_decision_function_sign_matches_predict(
+        self, trained_detector, sample_training_data
+    ):
+        """Test negative forest scores are exactly the points predict() flags."""
+        # detect_batch reuses decision_function instead of calling predict()
+        X = np.vstack(
+            [
+                sample_training_data[AnomalyDetector.FEATURE_NAMES].to_numpy(),
+                [
+                    _metrics(**overrides).to_feature_array()
+                    for overrides in (SPIKE_RPS, SPIKE_LAT, SPIKE_ERR)
+                ],
+            ]
         )
+        X_scaled = trained_detector.scaler.transform(X)
+
+        scores = trained_detector.model.decision_function(X_scaled)
+        labels = trained_detector.model.predict(X_scaled)
+
+        np.testing.assert_array_equal(scores < 0, labels == -1)
 
+    def test_detect_untrained_model(self, untrained_detector):
+        """Test that detection fails on untrained model."""
         with pytest.raises(RuntimeError, match="Model must be trained"):
-            detector.detect(metrics)
+            untrained_detector.detect(_metrics())
 
-    def test_save_and_load(self, trained_detector):
+    def test_save_and_load(self, trained_detector, tmp_path):
         """Test model save and load."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            save_path = Path(tmpdir) / "model"
-
-            # Save model
-            trained_detector.save(save_path)
-
-            # Verify files exist
-            assert (save_path / "isolation_forest.joblib").exists()
-            assert (save_path / "scaler.joblib").exists()
-            assert (save_path / "metadata.joblib").exists()
-
-            # Load model
-            loaded_detector = AnomalyDetector.load(save_path)
-
-            assert loaded_detector.is_trained
-            assert loaded_detector.training_samples == trained_detector.training_samples
-
-            # Test detection with loaded model
-            metrics = TrafficMetrics(
-                timestamp=datetime.utcnow(),
-                requests_per_second=50.0,
-                avg_latency_ms=30.0,
-                p95_latency_ms=60.0,
-                p99_latency_ms=90.0,
-                error_rate=0.02,
-            )
-            result = loaded_detector.detect(metrics)
-            assert isinstance(result, AnomalyResult)
+        save_path = tmp_path / "model"
+
+        # Save model
+        trained_detector.save(save_path)
+
+        # Verify files exist
+        assert (save_path / "isolation_forest.joblib").exists()
+        assert (save_path / "scaler.joblib").exists()
+        assert (save_path / "metadata.joblib").exists()
+
+        # Load model
+        loaded_detector = AnomalyDetector.load(save_path)
+
+        assert loaded_detector.is_trained
+        assert loaded_detector.training_samples == trained_detector.training_samples
+
+    def test_save_and_load_file_object(self, trained_detector):
+        """Test model save and load through an in-memory buffer."""
+        buffer = io.BytesIO()
+        trained_detector.save(buffer)
+        buffer.seek(0)
+
+        loaded_detector = AnomalyDetector.load(buffer)
+
+        assert loaded_detector.is_trained
+        assert loaded_detector.training_samples == trained_detector.training_samples
+        assert loaded_detector.baselines == trained_detector.baselines
+
+        # Test detection with loaded model
+        metrics = _metrics()
+        result = loaded_detector.detect(metrics)
+        assert result == trained_detector.detect(metrics)
 
     def test_get_model_info(self, trained_detector):
         """Test model info retrieval."""
@@ -345,19 +327,9 @@ class TestAnomalyDetector:
         assert info["feature_names"] == AnomalyDetector.FEATURE_NAMES
         assert info["baselines"] is not None
 
-    def test_anomaly_result_to_dict(self, trained_detector):
+    def test_anomaly_result_to_dict(self, detection_results):
         """Test AnomalyResult serialization."""
-        metrics = TrafficMetrics(
-            timestamp=datetime.utcnow(),
-            requests_per_second=500.0,
-            avg_latency_ms=30.0,
-            p95_latency_ms=60.0,
-            p99_latency_ms=90.0,
-            error_rate=0.02,
-        )
-
-        result = trained_detector.detect(metrics)
-        result_dict = result.to_dict()
+        result_dict = detection_results["traffic_spike"].to_dict()
 
         assert "is_anomaly" in result_dict
         assert "score" in result_dict
@@ -373,47 +345,9 @@ class TestAnomalyDetector:
 class TestRealTimeAnomalyDetector:
     """Tests for RealTimeAnomalyDetector class."""
 
-    @pytest.fixture
-    def realtime_detector(self, sample_training_data):
-        """Create a realtime detector with trained base model."""
-        base_detector = AnomalyDetector(contamination=0.1)
-        base_detector.train(sample_training_data)
-        return RealTimeAnomalyDetector(
-            base_detector, window_size=10, persistence_threshold=3
-        )
-
-    @pytest.fixture
-    def sample_training_data(self):
-        """Generate sample training data."""
-        np.random.seed(42)
-        n_samples = 1000
-
-        data = pd.DataFrame(
-            {
-                "requests_per_second": np.random.normal(50, 10, n_samples),
-                "avg_latency_ms": np.random.lognormal(3.5, 0.5, n_samples),
-                "p95_latency_ms": np.random.lognormal(4.0, 0.5, n_samples),
-                "p99_latency_ms": np.random.lognormal(4.5, 0.5, n_samples),
-                "error_rate": np.abs(np.random.normal(0.02, 0.01, n_samples)),
-            }
-        )
-
-        data["requests_per_second"] = data["requests_per_second"].clip(1, 200)
-        data["error_rate"] = data["error_rate"].clip(0, 1)
-
-        return data
-
     def test_process_normal_traffic(self, realtime_detector):
         """Test processing normal traffic."""
-        metrics = {
-            "requests_per_second": 50.0,
-            "avg_latency_ms": 30.0,
-            "p95_latency_ms": 60.0,
-            "p99_latency_ms": 90.0,
-            "error_rate": 0.02,
-        }
-
-        result = realtime_detector.process(metrics)
+        result = realtime_detector.process(NORMAL)
 
         assert isinstance(result, AnomalyResult)
         assert not result.is_anomaly
@@ -421,64 +355,55 @@ class TestRealTimeAnomalyDetector:
 
     def test_sliding_window(self, realtime_detector):
         """Test sliding window behavior."""
-        for i in range(15):
-            metrics = {
-                "requests_per_second": 50.0 + i,
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            }
-            realtime_detector.process(metrics)
+        metrics_list = [
+            _metrics(requests_per_second=rps) for rps in 50.0 + np.arange(15)
+        ]
+
+        realtime_detector.process_batch(metrics_list)
 
         # Window should be capped at window_size
         assert len(realtime_detector.window) == 10
+        assert realtime_detector.window == metrics_list[-10:]
 
     def test_anomaly_persistence(self, realtime_detector):
         """Test anomaly persistence tracking."""
         # Send normal traffic
-        for _ in range(5):
-            metrics = {
-                "requests_per_second": 50.0,
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            }
-            realtime_detector.process(metrics)
+        realtime_detector.process_batch([_metrics() for _ in range(5)])
 
         assert realtime_detector.anomaly_streak == 0
 
         # Send anomalous traffic
-        for i in range(5):
-            metrics = {
-                "requests_per_second": 500.0,  # Anomaly
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            }
-            result = realtime_detector.process(metrics)
+        results = realtime_detector.process_batch(
+            [_metrics(**SPIKE_RPS) for _ in range(5)]  # Anomaly
+        )
+
+        # After persistence_threshold, explanation should be "CONFIRMED"
+        for result in results[2:]:  # persistence_threshold = 3
+            assert "CONFIRMED" in result.explanation
+
+    def test_process_batch_matches_process(self, realtime_detector, trained_detector):
+        """Test that batch processing replays the same state as process()."""
+        metrics_list = [
+            _metrics(requests_per_second=rps) for rps in (50.0, 500.0, 55.0, 45.0)
+        ] + [_metrics(**SPIKE_ERR) for _ in range(4)]
 
-            # After persistence_threshold, explanation should be "CONFIRMED"
-            if i >= 2:  # persistence_threshold = 3
-                assert (
-                    "CONFIRMED" in result.explanation
-                    or realtime_detector.anomaly_streak >= 3
-                )
+        sequential = RealTimeAnomalyDetector(
+            trained_detector, window_size=10, persistence_threshold=3
+        )
+        expected = [sequential.process(m) for m in metrics_list]
+
+        results = realtime_detector.process_batch(metrics_list)
+
+        assert results == expected
+        assert realtime_detector.anomaly_streak == sequential.anomaly_streak
+        assert realtime_detector.last_results == sequential.last_results
 
     def test_get_trend(self, realtime_detector):
         """Test trend analysis."""
         # Process some data points
-        for i in range(10):
-            metrics = {
-                "requests_per_second": 50.0 + i * 5,  # Increasing
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            }
-            realtime_detector.process(metrics)
+        realtime_detector.process_batch(
+            [{**NORMAL, "requests_per_second": 50.0 + i * 5} for i in range(10)]
+        )
 
         trend = realtime_detector.get_trend()
 
@@ -492,15 +417,7 @@ class TestRealTimeAnomalyDetector:
     def test_reset(self, realtime_detector):
         """Test reset functionality."""
         # Process some data
-        for _ in range(5):
-            metrics = {
-                "requests_per_second": 50.0,
-                "avg_latency_ms": 30.0,
-                "p95_latency_ms": 60.0,
-                "p99_latency_ms": 90.0,
-                "error_rate": 0.02,
-            }
-            realtime_detector.process(metrics)
+        realtime_detector.process_batch([_metrics() for _ in range(5)])
 
         assert len(realtime_detector.window) == 5
 
@@ -515,21 +432,33 @@ class TestRealTimeAnomalyDetector:
 class TestAnomalyTypes:
     """Tests for anomaly type enums."""
 
-    def test_anomaly_type_values(self):
+    @pytest.mark.parametrize(
+        "member,expected",
+        [
+            (AnomalyType.TRAFFIC_SPIKE, "traffic_spike"),
+            (AnomalyType.TRAFFIC_DROP, "traffic_drop"),
+            (AnomalyType.LATENCY_SPIKE, "latency_spike"),
+            (AnomalyType.ERROR_RATE_SPIKE, "error_rate_spike"),
+            (AnomalyType.PATTERN_ANOMALY, "pattern_anomaly"),
+            (AnomalyType.MULTI_DIMENSIONAL, "multi_dimensional"),
+        ],
+    )
+    def test_anomaly_type_value(self, member, expected):
         """Test AnomalyType enum values."""
-        assert AnomalyType.TRAFFIC_SPIKE.value == "traffic_spike"
-        assert AnomalyType.TRAFFIC_DROP.value == "traffic_drop"
-        assert AnomalyType.LATENCY_SPIKE.value == "latency_spike"
-        assert AnomalyType.ERROR_RATE_SPIKE.value == "error_rate_spike"
-        assert AnomalyType.PATTERN_ANOMALY.value == "pattern_anomaly"
-        assert AnomalyType.MULTI_DIMENSIONAL.value == "multi_dimensional"
-
-    def test_anomaly_severity_values(self):
+        assert member.value == expected
+
+    @pytest.mark.parametrize(
+        "member,expected",
+        [
+            (AnomalySeverity.LOW, "low"),
+            (AnomalySeverity.MEDIUM, "medium"),
+            (AnomalySeverity.HIGH, "high"),
+            (AnomalySeverity.CRITICAL, "critical"),
+        ],
+    )
+    def test_anomaly_severity_value(self, member, expected):
         """Test AnomalySeverity enum values."""
-        assert AnomalySeverity.LOW.value == "low"
-        assert AnomalySeverity.MEDIUM.value == "medium"
-        assert AnomalySeverity.HIGH.value == "high"
-        assert AnomalySeverity.CRITICAL.value == "critical"
+        assert member.value == expected
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+AEGIS ML - Training Data Export Tests
+
+Unit tests for the export script's statement configuration.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import export_training_data
+from scripts.export_training_data import (
+    EXPORT_DTYPES,
+    PREPARED_STATEMENTS,
+    STATEMENT_VARIANTS,
+    TIMESTAMP_DTYPE,
+)
+
+# Output columns holding timestamps in any export
+TIMESTAMP_COLUMNS = ("time_bucket", "timestamp", "first_request", "last_request")
+
+
+def _timestamp_outputs(sql: str) -> list[str]:
+    """Find timestamp columns in a statement's select lists."""
+    return [
+        column
+        for column in TIMESTAMP_COLUMNS
+        # A select item on its own line: "col,", "alias.col," or "... as col,"
+        if re.search(rf"^\s*(?:.*\bas\s+|\w+\.)?{column},?\s*$", sql, re.M | re.I)
+    ]
+
+
+class TestExportDtypes:
+    """Tests for the dtypes applied to loaded exports."""
+
+    @pytest.mark.parametrize("name", list(PREPARED_STATEMENTS))
+    def test_timestamp_columns_have_dtype(self, name):
+        """Test every statement returning timestamps casts them on load."""
+        sql, _ = PREPARED_STATEMENTS[name]
+        dtype = EXPORT_DTYPES.get(name, {})
+
+        for column in _timestamp_outputs(sql):
+            assert dtype.get(column) == TIMESTAMP_DTYPE, f"{name}.{column}"
+
+    @pytest.mark.parametrize(
+        "name, variant",
+        [
+            (name, variant)
+            for name, variants in STATEMENT_VARIANTS.items()
+            for variant, _ in variants
+        ],
+    )
+    def test_variants_share_base_dtypes(self, name, variant):
+        """Test statement variants load with the same dtypes as their base."""
+        assert EXPORT_DTYPES[variant] == EXPORT_DTYPES[name]
+
+
+class _FakeConnection:
+    """Records whether main() closed the connection it was handed."""
+
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestMain:
+    """Tests for the command-line entry point."""
+
+    @pytest.mark.parametrize(
+        "total_records, exit_code", [(10, 0), (0, 1)], ids=["data", "empty"]
+    )
+    def test_dry_run_closes_connection(self, monkeypatch, total_records, exit_code):
+        """Test the shared connection is closed on the dry-run exit paths."""
+        conn = _FakeConnection()
+        monkeypatch.setattr(export_training_data, "get_connection", lambda _: conn)
+        monkeypatch.setattr(
+            export_training_data,
+            "get_data_stats",
+            lambda *args: {"total_records": total_records},
+        )
+        monkeypatch.setattr(sys, "argv", ["export_training_data.py", "--dry-run"])
+
+        with pytest.raises(SystemExit) as exc_info:
+            export_training_data.main()
+
+        assert exc_info.value.code == exit_code
+        assert conn.closed
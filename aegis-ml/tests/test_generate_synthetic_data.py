@@ -0,0 +1,239 @@
+"""
+AEGIS ML - Synthetic Data Generator Tests
+
+Unit tests for the synthetic data generation script.
+"""
+
+import argparse
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import generate_synthetic_data
+from scripts.generate_synthetic_data import (
+    generate_aggregated_metrics,
+    generate_request_ids,
+    generate_request_logs,
+    generate_sharded,
+    iter_shards,
+    positive_float,
+    shard_writer,
+)
+
+START = datetime(2024, 1, 1)
+END = START + timedelta(minutes=10)
+
+# Columns stored as categoricals
+CATEGORICAL_COLUMNS = [
+    "method",
+    "path",
+    "user_id",
+    "ip_address",
+    "user_agent",
+    "backend_name",
+    "error_message",
+    "anomaly_type",
+]
+
+
+@pytest.fixture(scope="module")
+def request_logs():
+    """Ten minutes of request logs at a low rate (shared, read-only)."""
+    return generate_request_logs(START, END, base_rps=5, seed=42)
+
+
+class TestRequestLogs:
+    """Tests for generate_request_logs."""
+
+    def test_same_seed_same_frame(self, request_logs):
+        """Test the same seed reproduces the same frame."""
+        again = generate_request_logs(START, END, base_rps=5, seed=42)
+
+        pd.testing.assert_frame_equal(request_logs, again)
+
+    def test_different_seed_different_frame(self, request_logs):
+        """Test a different seed gives different data."""
+        other = generate_request_logs(START, END, base_rps=5, seed=43)
+
+        assert not request_logs.equals(other)
+
+    def test_column_dtypes(self, request_logs):
+        """Test the compact column dtypes."""
+        assert request_logs["timestamp"].dtype.kind == "M"
+        assert request_logs["status_code"].dtype == np.int16
+        assert request_logs["response_time_ms"].dtype == np.int32
+        for column in CATEGORICAL_COLUMNS:
+            assert isinstance(request_logs[column].dtype, pd.CategoricalDtype), column
+
+    def test_categoricals_hold_expected_values(self, request_logs):
+        """Test categorical codes decode to the expected values."""
+        assert set(request_logs["method"].cat.categories) <= {
+            "GET",
+            "POST",
+            "PUT",
+            "DELETE",
+        }
+        assert request_logs["path"].str.startswith("/api/").all()
+
+        # Error messages are set exactly on error responses
+        is_error = request_logs["status_code"] >= 400
+        assert request_logs["error_message"].notna().eq(is_error).all()
+
+    def test_timestamps_in_range(self, request_logs):
+        """Test every record falls inside the requested range."""
+        assert request_logs["timestamp"].min() >= START
+        assert request_logs["timestamp"].max() < END
+        # Requests are spread randomly within each second, so order holds
+        # at whole-second resolution
+        assert request_logs["timestamp"].dt.floor("s").is_monotonic_increasing
+
+
+class TestRequestIds:
+    """Tests for bulk UUID generation."""
+
+    def test_valid_uuid4(self):
+        """Test generated IDs are valid, unique version 4 UUIDs."""
+        ids = generate_request_ids(1000, np.random.default_rng(0))
+
+        parsed = [uuid.UUID(request_id) for request_id in ids]
+        assert all(u.version == 4 for u in parsed)
+        assert all(u.variant == uuid.RFC_4122 for u in parsed)
+        assert [str(u) for u in parsed] == list(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_same_seed_same_ids(self):
+        """Test IDs are reproducible from the generator's seed."""
+        first = generate_request_ids(100, np.random.default_rng(7))
+        second = generate_request_ids(100, np.random.default_rng(7))
+
+        assert np.array_equal(first, second)
+
+    @pytest.mark.skipif(
+        generate_synthetic_data.njit is None, reason="numba is not installed"
+    )
+    def test_jit_matches_numpy(self):
+        """Test the compiled hex encoding matches the numpy one byte for byte."""
+        raw = np.random.default_rng(0).integers(0, 256, size=(1000, 16), dtype=np.uint8)
+        # Cover every byte value in every position
+        raw[:256] = np.arange(256, dtype=np.uint8)[:, None]
+
+        jit_chars = generate_synthetic_data._format_uuid_bytes_jit(
+            raw, generate_synthetic_data._HEX_DIGITS
+        )
+
+        assert np.array_equal(
+            jit_chars, generate_synthetic_data._format_uuid_bytes(raw)
+        )
+
+
+class TestSharding:
+    """Tests for sharded generation."""
+
+    def test_single_shard_matches_direct_call(self):
+        """Test one shard is the generator run with the spawned child seed."""
+        (shard,) = iter_shards(generate_request_logs, START, END, seed=42, base_rps=5)
+        child_seed = np.random.SeedSequence(42).spawn(1)[0]
+
+        direct = generate_request_logs(START, END, base_rps=5, seed=child_seed)
+
+        pd.testing.assert_frame_equal(shard, direct)
+
+    def test_parallel_matches_in_process(self):
+        """Test worker processes produce the same shards as in-process runs."""
+        kwargs = dict(shard_steps=120, seed=42, base_rps=5)
+
+        serial = generate_sharded(
+            generate_request_logs, START, END, workers=1, **kwargs
+        )
+        parallel = generate_sharded(
+            generate_request_logs, START, END, workers=2, **kwargs
+        )
+
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_shards_cover_range_in_order(self):
+        """Test shards are contiguous and in time order."""
+        shards = list(
+            iter_shards(
+                generate_request_logs, START, END, shard_steps=120, seed=42, base_rps=5
+            )
+        )
+
+        assert len(shards) == 5
+        combined = pd.concat(shards, ignore_index=True)
+        assert combined["timestamp"].dt.floor("s").is_monotonic_increasing
+        assert combined["timestamp"].min() >= START
+        assert combined["timestamp"].max() < END
+
+
+class TestShardWriter:
+    """Tests for writing shards to one output file."""
+
+    @pytest.mark.parametrize("format_type", ["csv", "json"])
+    def test_matches_single_write(self, request_logs, tmp_path, format_type):
+        """Test appended shards give the same file as one full write."""
+        sharded_path = tmp_path / f"sharded.{format_type}"
+        full_path = tmp_path / f"full.{format_type}"
+
+        # Include an empty shard, as a quiet time range produces
+        with shard_writer(sharded_path, format_type) as write:
+            write(request_logs.iloc[:100])
+            write(request_logs.iloc[:0])
+            write(request_logs.iloc[100:])
+
+        if format_type == "csv":
+            request_logs.to_csv(full_path, index=False)
+        else:
+            request_logs.to_json(
+                full_path, orient="records", date_format="iso", indent=2
+            )
+
+        assert sharded_path.read_bytes() == full_path.read_bytes()
+
+    def test_json_without_rows(self, request_logs, tmp_path):
+        """Test a JSON file with only empty shards matches an empty write."""
+        sharded_path = tmp_path / "sharded.json"
+        with shard_writer(sharded_path, "json") as write:
+            write(request_logs.iloc[:0])
+
+        expected = request_logs.iloc[:0].to_json(
+            orient="records", date_format="iso", indent=2
+        )
+        assert sharded_path.read_text() == expected
+
+
+class TestAggregatedMetrics:
+    """Tests for generate_aggregated_metrics."""
+
+    def test_same_seed_same_frame(self):
+        """Test the same seed reproduces the same frame."""
+        end = START + timedelta(hours=2)
+        first = generate_aggregated_metrics(START, end, seed=1)
+        second = generate_aggregated_metrics(START, end, seed=1)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert len(first) == 120
+        assert isinstance(first["anomaly_type"].dtype, pd.CategoricalDtype)
+        assert first["is_anomaly"].dtype == bool
+
+
+class TestArguments:
+    """Tests for command-line argument parsing."""
+
+    def test_positive_float(self):
+        """Test positive rates are accepted."""
+        assert positive_float("0.5") == 0.5
+        assert positive_float("200") == 200.0
+
+    @pytest.mark.parametrize("value", ["0", "-5", "nan"])
+    def test_positive_float_rejects(self, value):
+        """Test zero, negative and NaN rates are rejected."""
+        with pytest.raises(argparse.ArgumentTypeError, match="greater than 0"):
+            positive_float(value)
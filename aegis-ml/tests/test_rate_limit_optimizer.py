@@ -4,11 +4,16 @@ AEGIS ML - Rate Limit Optimizer Tests
 Unit tests for the rate limit optimization module.
 """
 
+import copy
+import dataclasses
+import io
 import shutil
 import sys
 import tempfile
 from datetime import datetime, timedelta
+from itertools import chain
 from pathlib import Path
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
@@ -16,6 +21,7 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from models import rate_limit_optimizer
 from models.rate_limit_optimizer import (
     EndpointProfile,
     OptimizationStrategy,
@@ -23,27 +29,49 @@ from models.rate_limit_optimizer import (
     RateLimitRecommendation,
     TierConfiguration,
     TierLevel,
+    _round_to_nice_number_vec,
 )
 
+# Tiers and strategies in the order their limits should ascend
+TIERS = ["free", "basic", "standard", "premium", "enterprise"]
+STRATEGIES = [
+    OptimizationStrategy.CONSERVATIVE,
+    OptimizationStrategy.BALANCED,
+    OptimizationStrategy.PERMISSIVE,
+]
+
+
+# Profile shared by the serialization tests; read-only so tests cannot
+# leak changes into each other
+PROFILE_FIELDS = MappingProxyType(
+    {
+        "endpoint": "/api/users",
+        "method": "GET",
+        "avg_requests_per_minute": 100.0,
+        "peak_requests_per_minute": 250.0,
+        "p95_requests_per_minute": 180.0,
+        "avg_latency_ms": 50.0,
+        "error_rate": 0.02,
+        "unique_users": 500,
+        "total_requests": 10000,
+        "typical_burst_size": 20,
+        "time_of_day_variance": 0.3,
+    }
+)
+
+
+def _has_warning(warnings: list[str], substr: str) -> bool:
+    """Check whether any warning contains substr, ignoring case."""
+    substr = substr.lower()
+    return any(substr in w.lower() for w in warnings)
+
 
 class TestEndpointProfile:
     """Tests for EndpointProfile dataclass."""
 
     def test_to_dict(self):
         """Test EndpointProfile serialization."""
-        profile = EndpointProfile(
-            endpoint="/api/users",
-            method="GET",
-            avg_requests_per_minute=100.0,
-            peak_requests_per_minute=250.0,
-            p95_requests_per_minute=180.0,
-            avg_latency_ms=50.0,
-            error_rate=0.02,
-            unique_users=500,
-            total_requests=10000,
-            typical_burst_size=20,
-            time_of_day_variance=0.3,
-        )
+        profile = EndpointProfile(**PROFILE_FIELDS)
 
         result = profile.to_dict()
 
@@ -58,6 +86,23 @@ class TestEndpointProfile:
         assert result["total_requests"] == 10000
         assert result["typical_burst_size"] == 20
         assert result["time_of_day_variance"] == 0.3
+        assert result.keys() == {f.name for f in dataclasses.fields(EndpointProfile)}
+
+    def test_to_dict_non_finite_values(self):
+        """Test NaN and infinite metrics serialize as None."""
+        profile = EndpointProfile(
+            **{
+                **PROFILE_FIELDS,
+                "avg_latency_ms": float("nan"),
+                "error_rate": float("inf"),
+            }
+        )
+
+        result = profile.to_dict()
+
+        assert result["avg_latency_ms"] is None
+        assert result["error_rate"] is None
+        assert result["p95_requests_per_minute"] == 180.0
 
 
 class TestRateLimitRecommendation:
@@ -90,19 +135,7 @@ class TestRateLimitRecommendation:
 
     def test_to_dict_with_profile(self):
         """Test recommendation serialization with profile."""
-        profile = EndpointProfile(
-            endpoint="/api/users",
-            method="GET",
-            avg_requests_per_minute=100.0,
-            peak_requests_per_minute=250.0,
-            p95_requests_per_minute=180.0,
-            avg_latency_ms=50.0,
-            error_rate=0.02,
-            unique_users=500,
-            total_requests=10000,
-            typical_burst_size=20,
-            time_of_day_variance=0.3,
-        )
+        profile = EndpointProfile(**PROFILE_FIELDS)
 
         rec = RateLimitRecommendation(
             endpoint="/api/users",
@@ -140,60 +173,10 @@ class TestTierConfiguration:
 class TestRateLimitOptimizer:
     """Tests for RateLimitOptimizer class."""
 
-    @pytest.fixture
-    def sample_endpoint_data(self):
-        """Generate sample endpoint data for testing."""
-        np.random.seed(42)
-        n_samples = 5000
-        endpoints = [
-            "/api/users",
-            "/api/orders",
-            "/api/products",
-            "/api/health",
-            "/api/auth/login",
-        ]
-
-        timestamps = pd.date_range(
-            end=datetime.utcnow(),
-            periods=n_samples,
-            freq="1s",
-        )
-
-        data = pd.DataFrame(
-            {
-                "timestamp": timestamps,
-                "endpoint": np.random.choice(
-                    endpoints, n_samples, p=[0.3, 0.25, 0.25, 0.15, 0.05]
-                ),
-                "method": np.random.choice(
-                    ["GET", "POST", "PUT", "DELETE"],
-                    n_samples,
-                    p=[0.6, 0.25, 0.1, 0.05],
-                ),
-                "response_time_ms": np.random.lognormal(3.5, 0.5, n_samples),
-                "status_code": np.random.choice(
-                    [200, 201, 400, 404, 500],
-                    n_samples,
-                    p=[0.85, 0.05, 0.05, 0.03, 0.02],
-                ),
-                "user_id": [
-                    f"user_{i % 100:04d}" if np.random.random() > 0.2 else None
-                    for i in range(n_samples)
-                ],
-                "ip_address": [
-                    f"192.168.{i % 256}.{(i * 7) % 256}" for i in range(n_samples)
-                ],
-            }
-        )
-
-        return data
-
-    @pytest.fixture
-    def trained_optimizer(self, sample_endpoint_data):
-        """Create a trained optimizer."""
-        optimizer = RateLimitOptimizer()
-        optimizer.analyze_traffic(sample_endpoint_data)
-        return optimizer
+    @pytest.fixture(scope="class")
+    def untrained_optimizer(self):
+        """Create a default optimizer that is never trained (shared, read-only)."""
+        return RateLimitOptimizer()
 
     def test_initialization(self):
         """Test optimizer initialization."""
@@ -206,6 +189,11 @@ class TestRateLimitOptimizer:
         assert optimizer.headroom_percent == 30.0
         assert not optimizer.is_trained
 
+    @pytest.mark.parametrize(
+        "sample_endpoint_data",
+        [500, pytest.param(5000, marks=pytest.mark.slow)],
+        indirect=True,
+    )
     def test_analyze_traffic(self, sample_endpoint_data):
         """Test traffic analysis."""
         optimizer = RateLimitOptimizer()
@@ -234,10 +222,9 @@ class TestRateLimitOptimizer:
         assert 0 <= rec.confidence <= 1
         assert rec.profile is not None
 
-    def test_recommend_without_profile(self):
+    def test_recommend_without_profile(self, untrained_optimizer):
         """Test recommendation for unknown endpoint."""
-        optimizer = RateLimitOptimizer()
-        rec = optimizer.recommend(
+        rec = untrained_optimizer.recommend(
             endpoint="/api/unknown",
             tier="default",
         )
@@ -247,40 +234,85 @@ class TestRateLimitOptimizer:
         assert rec.confidence < 0.5  # Low confidence without data
         assert "No traffic data" in rec.warnings[0]
 
-    def test_recommend_different_tiers(self, trained_optimizer):
-        """Test recommendations for different tiers."""
-        tiers = ["free", "basic", "standard", "premium", "enterprise"]
-        limits = []
-
-        for tier in tiers:
-            rec = trained_optimizer.recommend(
+    @pytest.fixture(scope="class")
+    def tier_recommendations(self, trained_optimizer):
+        """Recommend /api/users limits once per tier, in ascending tier order."""
+        return {
+            tier: trained_optimizer.recommend(endpoint="/api/users", tier=tier)
+            for tier in TIERS
+        }
+
+    @pytest.fixture(scope="class")
+    def strategy_recommendations(self, trained_optimizer):
+        """Recommend /api/users limits once per strategy, strictest first."""
+        return {
+            strategy: trained_optimizer.recommend(
                 endpoint="/api/users",
-                tier=tier,
+                tier="default",
+                strategy=strategy,
             )
-            limits.append(rec.recommended_limit)
+            for strategy in STRATEGIES
+        }
+
+    @pytest.mark.parametrize("tier", TIERS)
+    def test_recommend_tier(self, tier_recommendations, tier):
+        """Test recommendation for a single tier."""
+        rec = tier_recommendations[tier]
+
+        assert rec.tier == tier
+        assert rec.recommended_limit > 0
+
+    def test_recommend_different_tiers(self, tier_recommendations):
+        """Test recommendations for different tiers."""
+        limits = [rec.recommended_limit for rec in tier_recommendations.values()]
 
         # Higher tiers should have higher limits
-        assert limits[0] <= limits[1] <= limits[2] <= limits[3] <= limits[4]
+        assert limits == sorted(limits)
+
+    def test_endpoint_features_reused_across_tiers(self, trained_optimizer):
+        """Test tier-independent features are computed once per endpoint."""
+        optimizer = copy.deepcopy(trained_optimizer)
+        profile = optimizer.endpoint_profiles["/api/users"]
+        features = optimizer._endpoint_features("/api/users", profile)
+
+        for tier in TIERS:
+            optimizer.recommend(endpoint="/api/users", tier=tier)
+        assert optimizer._endpoint_features("/api/users", profile) is features
+
+        # Changing the headroom invalidates the cached base limit
+        optimizer.headroom_percent = 100.0
+        refreshed = optimizer._endpoint_features("/api/users", profile)
+        assert refreshed is not features
+        assert refreshed.base_limit == optimizer._calculate_base_limit(profile)
+
+    def test_endpoint_features_follow_profile_edits(self, trained_optimizer):
+        """Test editing a profile in place refreshes its cached features."""
+        optimizer = copy.deepcopy(trained_optimizer)
+        before = optimizer.recommend(endpoint="/api/users")
+
+        profile = optimizer.endpoint_profiles["/api/users"]
+        profile.p95_requests_per_minute *= 10
+        profile.time_of_day_variance = 0.0
+        after = optimizer.recommend(endpoint="/api/users")
+
+        assert after.recommended_limit > before.recommended_limit
+        assert after.recommended_limit == optimizer._calculate_base_limit(profile)
+        assert after.confidence == optimizer._calculate_confidence(profile)
+
+    @pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: s.value)
+    def test_recommend_strategy(self, strategy_recommendations, strategy):
+        """Test recommendation for a single strategy."""
+        rec = strategy_recommendations[strategy]
+
+        assert rec.strategy == strategy
+        assert rec.recommended_limit > 0
 
-    def test_recommend_different_strategies(self, trained_optimizer):
+    def test_recommend_different_strategies(self, strategy_recommendations):
         """Test recommendations with different strategies."""
-        strategies = [
-            OptimizationStrategy.CONSERVATIVE,
-            OptimizationStrategy.BALANCED,
-            OptimizationStrategy.PERMISSIVE,
-        ]
-        limits = []
-
-        for strategy in strategies:
-            rec = trained_optimizer.recommend(
-                endpoint="/api/users",
-                tier="default",
-                strategy=strategy,
-            )
-            limits.append(rec.recommended_limit)
+        limits = [rec.recommended_limit for rec in strategy_recommendations.values()]
 
         # Conservative < Balanced < Permissive
-        assert limits[0] <= limits[1] <= limits[2]
+        assert limits == sorted(limits)
 
     def test_recommend_all(self, trained_optimizer):
         """Test batch recommendations."""
@@ -291,16 +323,31 @@ class TestRateLimitOptimizer:
             assert rec.recommended_limit > 0
             assert rec.recommended_burst > 0
 
+    @pytest.mark.parametrize(
+        "strategy", list(OptimizationStrategy), ids=lambda s: s.value
+    )
+    def test_recommend_all_matches_recommend(self, trained_optimizer, strategy):
+        """Test the batch path gives the same recommendations as recommend()."""
+        batch = trained_optimizer.recommend_all(tier="premium", strategy=strategy)
+        single = [
+            trained_optimizer.recommend(endpoint, tier="premium", strategy=strategy)
+            for endpoint in trained_optimizer.endpoint_profiles
+        ]
+
+        assert [r.to_dict() for r in batch] == [r.to_dict() for r in single]
+
     def test_cluster_endpoints(self, trained_optimizer):
         """Test endpoint clustering."""
-        clusters = trained_optimizer.cluster_endpoints(n_clusters=3)
+        # Clustering fits state onto the optimizer, so work on a copy
+        optimizer = copy.deepcopy(trained_optimizer)
+        clusters = optimizer.cluster_endpoints(n_clusters=3)
 
         assert len(clusters) > 0
-        # All endpoints should be assigned to a cluster
-        all_endpoints = []
-        for endpoints in clusters.values():
-            all_endpoints.extend(endpoints)
-        assert len(all_endpoints) == len(trained_optimizer.endpoint_profiles)
+        # Every endpoint should be assigned to exactly one cluster
+        assert sum(map(len, clusters.values())) == len(optimizer.endpoint_profiles)
+        assert set(chain.from_iterable(clusters.values())) == set(
+            optimizer.endpoint_profiles
+        )
 
     def test_save_and_load(self, trained_optimizer):
         """Test optimizer save and load."""
@@ -325,6 +372,44 @@ class TestRateLimitOptimizer:
             loaded_rec = loaded_optimizer.recommend("/api/users", "default")
             assert orig_rec.recommended_limit == loaded_rec.recommended_limit
 
+    def test_save_and_load_file_object(self, trained_optimizer):
+        """Test optimizer save and load through an in-memory buffer."""
+        buffer = io.BytesIO()
+        trained_optimizer.save(buffer)
+        buffer.seek(0)
+
+        loaded_optimizer = RateLimitOptimizer.load(buffer)
+
+        assert loaded_optimizer.is_trained
+        assert (
+            loaded_optimizer.training_timestamp == trained_optimizer.training_timestamp
+        )
+        assert [r.to_dict() for r in loaded_optimizer.recommend_all()] == [
+            r.to_dict() for r in trained_optimizer.recommend_all()
+        ]
+
+    def test_fresh_and_loaded_recommendations_match(
+        self, trained_optimizer, sample_endpoint_data
+    ):
+        """Test a freshly trained optimizer recommends what a loaded one does."""
+        # trained_optimizer comes from the on-disk cache when it is warm, so
+        # train from scratch here and round-trip that state as well
+        fresh = RateLimitOptimizer()
+        fresh.analyze_traffic(sample_endpoint_data)
+        buffer = io.BytesIO()
+        fresh.save(buffer)
+        buffer.seek(0)
+        loaded = RateLimitOptimizer.load(buffer)
+
+        for strategy in OptimizationStrategy:
+            expected = [r.to_dict() for r in fresh.recommend_all(strategy=strategy)]
+            assert [
+                r.to_dict() for r in loaded.recommend_all(strategy=strategy)
+            ] == expected
+            assert [
+                r.to_dict() for r in trained_optimizer.recommend_all(strategy=strategy)
+            ] == expected
+
     def test_get_optimizer_info(self, trained_optimizer):
         """Test optimizer info retrieval."""
         info = trained_optimizer.get_optimizer_info()
@@ -335,21 +420,22 @@ class TestRateLimitOptimizer:
         assert info["endpoint_count"] > 0
         assert len(info["endpoints"]) > 0
 
-    def test_warnings_for_high_error_rate(self, sample_endpoint_data):
+    def test_warnings_for_high_error_rate(self, mutable_endpoint_data):
         """Test that high error rate generates warning."""
-        # Modify data to have high error rate for one endpoint
-        sample_endpoint_data.loc[
-            sample_endpoint_data["endpoint"] == "/api/users", "status_code"
-        ] = 500
+        # Modify data to have high error rate for one endpoint; writing the
+        # raw array skips .loc alignment
+        mask = mutable_endpoint_data["endpoint"].to_numpy() == "/api/users"
+        status_codes = mutable_endpoint_data["status_code"].to_numpy(copy=True)
+        status_codes[mask] = 500
+        mutable_endpoint_data["status_code"] = status_codes
 
         optimizer = RateLimitOptimizer()
-        optimizer.analyze_traffic(sample_endpoint_data)
+        optimizer.analyze_traffic(mutable_endpoint_data)
 
         rec = optimizer.recommend("/api/users", "default")
 
         # Should have warning about high error rate
-        error_warnings = [w for w in rec.warnings if "error rate" in w.lower()]
-        assert len(error_warnings) > 0
+        assert _has_warning(rec.warnings, "error rate")
 
     def test_warnings_for_low_data(self):
         """Test that limited data generates warning."""
@@ -372,12 +458,11 @@ class TestRateLimitOptimizer:
         rec = optimizer.recommend("/api/test", "default")
 
         # Should have warning about limited data
-        data_warnings = [w for w in rec.warnings if "Limited" in w or "limited" in w]
-        assert len(data_warnings) > 0
+        assert _has_warning(rec.warnings, "limited")
 
-    def test_round_to_nice_number(self):
+    def test_round_to_nice_number(self, untrained_optimizer):
         """Test nice number rounding."""
-        optimizer = RateLimitOptimizer()
+        optimizer = untrained_optimizer
 
         assert optimizer._round_to_nice_number(7) == 7
         assert optimizer._round_to_nice_number(23) == 25
@@ -385,6 +470,35 @@ class TestRateLimitOptimizer:
         assert optimizer._round_to_nice_number(123) == 125
         assert optimizer._round_to_nice_number(780) == 800
         assert optimizer._round_to_nice_number(2340) == 2500
+        assert np.array_equal(
+            _round_to_nice_number_vec(np.array([7, 23, 67, 123, 780, 2340])),
+            np.array([7, 25, 70, 125, 800, 2500]),
+        )
+
+    def test_round_to_nice_number_vec_matches_scalar(self, untrained_optimizer):
+        """Test batch rounding agrees with the scalar method across every band."""
+        values = np.concatenate([np.arange(0, 6000, 0.5), [12345.6, 99999.0]])
+
+        expected = [untrained_optimizer._round_to_nice_number(v) for v in values]
+
+        assert _round_to_nice_number_vec(values).tolist() == expected
+
+    @pytest.mark.skipif(
+        rate_limit_optimizer.njit is None, reason="numba is not installed"
+    )
+    def test_round_to_nice_numbers_jit_matches_numpy(self):
+        """Test the numba rounding kernel agrees with the numpy path."""
+        values = np.concatenate([np.arange(0, 6000, 0.5), [12345.6, 99999.0]])
+
+        jitted = rate_limit_optimizer._round_to_nice_numbers_jit(
+            values,
+            rate_limit_optimizer._NICE_NUMBER_BOUNDS,
+            rate_limit_optimizer._NICE_NUMBER_STEPS,
+        )
+
+        assert np.array_equal(
+            jitted, rate_limit_optimizer._round_to_nice_numbers(values)
+        )
 
 
 class TestOptimizationStrategies:
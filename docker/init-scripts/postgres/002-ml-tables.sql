@@ -242,6 +242,77 @@ AS $$
     ORDER BY time_bucket;
 $$;
 
+-- Linear-interpolated percentile of an already sorted array
+-- (same definition as PERCENTILE_CONT)
+CREATE OR REPLACE FUNCTION sorted_percentile(
+    p_sorted NUMERIC[],
+    p_fraction NUMERIC
+)
+RETURNS NUMERIC
+LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE
+AS $$
+DECLARE
+    v_n INTEGER := COALESCE(array_length(p_sorted, 1), 0);
+    v_pos NUMERIC;
+    v_lo INTEGER;
+BEGIN
+    IF v_n = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    v_pos := 1 + p_fraction * (v_n - 1);
+    v_lo := floor(v_pos)::INTEGER;
+
+    IF v_lo >= v_n THEN
+        RETURN p_sorted[v_n];
+    END IF;
+
+    RETURN p_sorted[v_lo] + (p_sorted[v_lo + 1] - p_sorted[v_lo]) * (v_pos - v_lo);
+END;
+$$;
+
+-- Latency summary of one time bucket, computed from a single sorted copy of
+-- its values instead of a separate sort/aggregate pass per statistic.
+-- Used by the training data exporter as bucket_stats(array_agg(...)).
+CREATE OR REPLACE FUNCTION bucket_stats(vals NUMERIC[])
+RETURNS JSONB
+LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE
+AS $$
+DECLARE
+    v_sorted NUMERIC[];
+    v_n INTEGER;
+    v_sum NUMERIC := 0;
+    v_sum_sq NUMERIC := 0;
+    v_val NUMERIC;
+BEGIN
+    SELECT array_agg(x ORDER BY x) INTO v_sorted
+    FROM unnest(vals) AS x
+    WHERE x IS NOT NULL;
+
+    v_n := COALESCE(array_length(v_sorted, 1), 0);
+    IF v_n = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    FOREACH v_val IN ARRAY v_sorted LOOP
+        v_sum := v_sum + v_val;
+        v_sum_sq := v_sum_sq + v_val * v_val;
+    END LOOP;
+
+    RETURN jsonb_build_object(
+        'avg', round(v_sum / v_n, 2),
+        'p50', round(sorted_percentile(v_sorted, 0.50), 2),
+        'p95', round(sorted_percentile(v_sorted, 0.95), 2),
+        'p99', round(sorted_percentile(v_sorted, 0.99), 2),
+        'min', v_sorted[1],
+        'max', v_sorted[v_n],
+        'stddev', CASE
+            WHEN v_n > 1 THEN round(sqrt((v_sum_sq - v_sum * v_sum / v_n) / (v_n - 1)), 2)
+        END
+    );
+END;
+$$;
+
 -- Function to get endpoint-level training data
 CREATE OR REPLACE FUNCTION get_endpoint_training_data(
     p_start_time TIMESTAMPTZ,